@@ -0,0 +1,257 @@
+"""
+NumPy grid backend for Maze
+
+GridMaze parses a maze file into a NumPy character grid in one pass
+(start and goal found with array comparisons rather than a per-cell
+loop) and keeps the walls bit-packed: one bit per cell, in row-major
+order, so cell (row, col) is bit row * width + col. Neighbours come
+from index arithmetic on that flat layout, and solve() runs breadth-first
+search a whole level at a time over flat index arrays. That makes mazes
+of many millions of cells feasible to load and solve.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from maze import Maze
+
+SPACE = ord(" ")
+START = ord("A")
+GOAL = ord("B")
+
+# Direction codes stored per cell by solve(), to walk the solution back
+ACTIONS = ["up", "down", "left", "right"]
+
+
+class GridMaze(Maze):
+
+    def __init__(self, filename):
+
+        # Read file as bytes
+        with open(filename, "rb") as f:
+            data = np.frombuffer(f.read(), dtype=np.uint8)
+
+        # Validate start and goal
+        if np.count_nonzero(data == START) != 1:
+            raise Exception("maze must have exactly one start point")
+        if np.count_nonzero(data == GOAL) != 1:
+            raise Exception("maze must have exactly one goal")
+
+        grid = parse_grid(data)
+        self.height, self.width = grid.shape
+        self.start = divmod(int(np.flatnonzero(grid == START)[0]), self.width)
+        self.goal = divmod(int(np.flatnonzero(grid == GOAL)[0]), self.width)
+
+        # Bit-packed open cells: anything but a wall character
+        is_open = (grid == SPACE) | (grid == START) | (grid == GOAL)
+        self.open_bits = np.packbits(is_open.ravel())
+
+        self.solution = None
+        self.distances = None
+
+    @property
+    def size(self):
+        return self.height * self.width
+
+    @property
+    def walls(self):
+        """Walls as a (height, width) boolean array, unpacked on demand."""
+        return ~self.open_cells().reshape(self.height, self.width)
+
+    def open_cells(self):
+        """Returns a flat boolean array of the open cells."""
+        return np.unpackbits(self.open_bits, count=self.size).astype(bool)
+
+    def open_at(self, index):
+        """Returns True if the cell at flat index `index` is open."""
+        return bool((self.open_bits[index >> 3] >> (7 - (index & 7))) & 1)
+
+    def is_open(self, row, col):
+        return 0 <= row < self.height and 0 <= col < self.width and self.open_at(row * self.width + col)
+
+    def neighbors(self, state):
+        row, col = state
+        index = row * self.width + col
+        candidates = [
+            ("up", index - self.width, row > 0),
+            ("down", index + self.width, row < self.height - 1),
+            ("left", index - 1, col > 0),
+            ("right", index + 1, col < self.width - 1)
+        ]
+
+        result = []
+        for action, neighbor, in_bounds in candidates:
+            if in_bounds and self.open_at(neighbor):
+                result.append((action, divmod(neighbor, self.width)))
+        return result
+
+    def solve(self):
+        """Finds a solution to maze, if one exists, by level-synchronous BFS."""
+        width = self.width
+        is_open = self.open_cells()
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+
+        # Direction each cell was reached by (index into ACTIONS), or -1
+        came_from = np.full(self.size, -1, dtype=np.int8)
+        reached = np.zeros(self.size, dtype=bool)
+        expanded = np.zeros(self.size, dtype=bool)
+        reached[start] = True
+        layer = np.array([start], dtype=np.int64)
+        layers = []
+
+        while not reached[goal]:
+            if not len(layer):
+                raise Exception("no solution")
+            expanded[layer] = True
+            layers.append(layer)
+
+            columns = layer % width
+            steps = [
+                (layer >= width, -width),
+                (layer < self.size - width, width),
+                (columns > 0, -1),
+                (columns < width - 1, 1)
+            ]
+            next_layers = []
+            for direction, (in_bounds, step) in enumerate(steps):
+                candidates = layer[in_bounds] + step
+                candidates = candidates[is_open[candidates] & ~reached[candidates]]
+                reached[candidates] = True
+                came_from[candidates] = direction
+                next_layers.append(candidates)
+            layer = np.concatenate(next_layers)
+
+        # Walk back from the goal, undoing each step
+        undo = [width, -width, 1, -1]
+        actions = []
+        cells = []
+        index = goal
+        while index != start:
+            direction = came_from[index]
+            actions.append(ACTIONS[direction])
+            cells.append(divmod(index, width))
+            index += undo[direction]
+        actions.reverse()
+        cells.reverse()
+
+        self.num_explored = int(np.count_nonzero(expanded))
+        self.explored = CellMask(expanded.reshape(self.height, self.width))
+        self.explored_order = np.concatenate(layers)
+        self.solution = (actions, cells)
+
+    def compute_distance_field(self):
+        """
+        Computes every open cell's distance to the goal with one reverse
+        breadth-first search, a level at a time, into a flat int32 array.
+        """
+        width = self.width
+        is_open = self.open_cells()
+        goal = self.goal[0] * width + self.goal[1]
+
+        distances = np.full(self.size, -1, dtype=np.int32)
+        distances[goal] = 0
+        layer = np.array([goal], dtype=np.int64)
+        depth = 0
+        while len(layer):
+            depth += 1
+            columns = layer % width
+            next_layers = []
+            for in_bounds, step in [(layer >= width, -width), (layer < self.size - width, width),
+                                    (columns > 0, -1), (columns < width - 1, 1)]:
+                candidates = layer[in_bounds] + step
+                candidates = candidates[is_open[candidates] & (distances[candidates] < 0)]
+                distances[candidates] = depth
+                next_layers.append(candidates)
+            layer = np.concatenate(next_layers)
+        self.distances = distances
+
+    def distance_to_goal(self, cell):
+        distance = int(self.distances[cell[0] * self.width + cell[1]])
+        return None if distance < 0 else distance
+
+
+class CellMask():
+    """
+    Set-like view of the (row, col) cells marked in a boolean array,
+    so explored cells can be tested with `in` like Maze.explored.
+    """
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __contains__(self, cell):
+        return bool(self.mask[cell])
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
+
+    def __iter__(self):
+        return (tuple(cell) for cell in np.argwhere(self.mask).tolist())
+
+
+def parse_grid(data):
+    """
+    Returns a (height, width) uint8 array of maze characters from the
+    bytes of a maze file, padding short lines with spaces.
+    """
+    data = data[data != ord("\r")]
+    ends = np.flatnonzero(data == ord("\n"))
+    if len(data) and data[-1] != ord("\n"):
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+
+    width = int(lengths.max()) if len(lengths) else 0
+    grid = np.full((len(lengths), width), SPACE, dtype=np.uint8)
+    grid[np.arange(width) < lengths[:, None]] = data[data != ord("\n")]
+    return grid
+
+
+def generate(height, width, seed=0):
+    """
+    Returns the text of a random perfect maze (exactly one path between
+    any two open cells) with the given number of rooms in each direction,
+    built with the vectorised binary tree algorithm: every room opens a
+    passage either up or left. A is the bottom-right room, B the top-left.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.full((2 * height + 1, 2 * width + 1), ord("#"), dtype=np.uint8)
+    grid[1::2, 1::2] = SPACE
+
+    # Rooms on the top row can only open left, and in the left column only up
+    up = rng.random((height, width)) < 0.5
+    up[0, :] = False
+    up[:, 0] = True
+    up[0, 0] = False
+    rows, cols = np.nonzero(up)
+    grid[2 * rows, 2 * cols + 1] = SPACE
+    rows, cols = np.nonzero(~up)
+    keep = cols > 0
+    grid[2 * rows[keep] + 1, 2 * cols[keep]] = SPACE
+
+    grid[-2, -2] = START
+    grid[1, 1] = GOAL
+    lines = np.concatenate([grid, np.full((len(grid), 1), ord("\n"), dtype=np.uint8)], axis=1)
+    return lines.tobytes().decode("ascii")
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python gridmaze.py maze.txt")
+
+    started = time.perf_counter()
+    m = GridMaze(sys.argv[1])
+    print(f"Loaded {m.height}x{m.width} maze in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    m.solve()
+    print(f"Solved in {time.perf_counter() - started:.2f}s")
+    print("States Explored:", m.num_explored)
+    print("Solution Length:", len(m.solution[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import heapq
+import itertools
 import sys
 
+from collections import deque
+
+import search
+
 
 class Node():
     def __init__(self, state, parent, action):
@@ -46,6 +52,54 @@ class QueueFrontier(Frontier):
             return node
 
 
+class HashedFrontier(Frontier):
+    """Frontier with a count of held states, for O(1) contains_state"""
+
+    def __init__(self):
+        super().__init__()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def discard_state(self, state):
+        count = self.states[state] - 1
+        if count:
+            self.states[state] = count
+        else:
+            del self.states[state]
+
+
+class HashedStackFrontier(HashedFrontier):
+    """Last-in first-out with O(1) remove and contains_state: depth-first search"""
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        node = self.frontier.pop()
+        self.discard_state(node.state)
+        return node
+
+
+class HashedQueueFrontier(HashedFrontier):
+    """First-in first-out with O(1) remove and contains_state: breadth-first search"""
+
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        node = self.frontier.popleft()
+        self.discard_state(node.state)
+        return node
+
+
 class Maze():
 
     def __init__(self, filename):
@@ -86,6 +140,7 @@ class Maze():
             self.walls.append(row)
 
         self.solution = None
+        self.distances = None
 
     def print(self):
         solution = self.solution[1] if self.solution is not None else None
@@ -128,12 +183,13 @@ class Maze():
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        # frontier = StackFrontier()  # StackFrontier() for depth-first search
-        frontier = QueueFrontier()  # QueueFrontier() for breadth-first search
+        # frontier = HashedStackFrontier()  # HashedStackFrontier() for depth-first search
+        frontier = HashedQueueFrontier()  # HashedQueueFrontier() for breadth-first search
         frontier.add(start)
 
-        # Initialize an empty explored set
+        # Initialize an empty explored set, and the order cells are explored in
         self.explored = set()
+        self.explored_order = []
 
         # Keep looping until solution found
         while True:
@@ -161,6 +217,7 @@ class Maze():
 
             # Mark node as explored
             self.explored.add(node.state)
+            self.explored_order.append(node.state)
 
             # Add neighbors to frontier
             for action, state in self.neighbors(node.state):
@@ -168,66 +225,230 @@ class Maze():
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
+    def search(self, strategy="bfs"):
+        """
+        Finds a solution to maze with a strategy from the search module,
+        returning its Result (nodes expanded, peak frontier, wall time).
+        """
+        result = search.search(MazeProblem(self), strategy)
+        if not result.found:
+            raise Exception("no solution")
+        self.num_explored = result.nodes_expanded
+        self.explored = set(result.explored)
+        self.explored_order = list(result.explored)
+        self.solution = (result.actions, result.states)
+        return result
 
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
+    def is_open(self, row, col):
+        """Returns True if (row, col) is inside the maze and not a wall."""
+        return 0 <= row < self.height and 0 <= col < self.width and not self.walls[row][col]
+
+    def solve_jps(self):
+        """
+        Finds a shortest solution to maze with Jump Point Search: A* over
+        jump points only, skipping the open cells along straight runs
+        that have no other way through them. num_explored counts the
+        jump points expanded.
+        """
+        self.num_explored = 0
+        self.explored = set()
+        self.explored_order = []
+
+        # A* over jump points, with Manhattan distance as the heuristic
+        parents = {self.start: None}
+        costs = {self.start: 0}
+        tie = itertools.count()
+        frontier = [(self.manhattan(self.start), next(tie), self.start)]
+
+        while frontier:
+            _, _, cell = heapq.heappop(frontier)
+            if cell in self.explored:
+                continue
+            if cell == self.goal:
+                self.solution = self.expand_jumps(parents)
+                return
+            self.num_explored += 1
+            self.explored.add(cell)
+            self.explored_order.append(cell)
+
+            for direction in self.jps_directions(cell, parents[cell]):
+                jump_point = self.jump(cell, direction)
+                if jump_point is None or jump_point in self.explored:
+                    continue
+                cost = costs[cell] + abs(jump_point[0] - cell[0]) + abs(jump_point[1] - cell[1])
+                if cost < costs.get(jump_point, cost + 1):
+                    costs[jump_point] = cost
+                    parents[jump_point] = cell
+                    heapq.heappush(frontier, (cost + self.manhattan(jump_point), next(tie), jump_point))
+
+        raise Exception("no solution")
+
+    def manhattan(self, cell):
+        return abs(cell[0] - self.goal[0]) + abs(cell[1] - self.goal[1])
+
+    def jps_directions(self, cell, parent):
+        """
+        Returns the (row, col) step directions worth jumping in from a jump
+        point, pruned by the direction it was reached from.
+        """
+        row, col = cell
+        if parent is None:
+            candidates = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        else:
+            dr = (row > parent[0]) - (row < parent[0])
+            dc = (col > parent[1]) - (col < parent[1])
+            if dc:
+                candidates = [(0, dc), (-1, 0), (1, 0)]
+            else:
+                candidates = [(dr, 0), (0, -1), (0, 1)]
+        return [(dr, dc) for dr, dc in candidates if self.is_open(row + dr, col + dc)]
+
+    def jump(self, cell, direction):
+        """
+        Steps from `cell` in `direction` until reaching the goal or a jump
+        point (a cell with a forced neighbour), returning it, or None if a
+        wall is hit first. Vertical jumps also stop at any cell from which
+        a horizontal jump finds a jump point.
+        """
+        row, col = cell
+        dr, dc = direction
+        while True:
+            row, col = row + dr, col + dc
+            if not self.is_open(row, col):
+                return None
+            if (row, col) == self.goal:
+                return (row, col)
+
+            if dc:
+                # Moving horizontally: an opening above or below that was walled off one step back
+                if ((self.is_open(row - 1, col) and not self.is_open(row - 1, col - dc)) or
+                        (self.is_open(row + 1, col) and not self.is_open(row + 1, col - dc))):
+                    return (row, col)
+            else:
+                # Moving vertically: an opening to the side that was walled off one step back
+                if ((self.is_open(row, col - 1) and not self.is_open(row - dr, col - 1)) or
+                        (self.is_open(row, col + 1) and not self.is_open(row - dr, col + 1))):
+                    return (row, col)
+                if (self.jump((row, col), (0, 1)) is not None or
+                        self.jump((row, col), (0, -1)) is not None):
+                    return (row, col)
+
+    def expand_jumps(self, parents):
+        """
+        Returns the (actions, cells) solution through the chain of jump
+        points in `parents` that ends at the goal, filling in each straight run.
+        """
+        names = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+        jump_points = []
+        cell = self.goal
+        while cell is not None:
+            jump_points.append(cell)
+            cell = parents[cell]
+        jump_points.reverse()
+
+        actions = []
+        cells = []
+        for (row, col), end in zip(jump_points, jump_points[1:]):
+            dr = (end[0] > row) - (end[0] < row)
+            dc = (end[1] > col) - (end[1] < col)
+            while (row, col) != end:
+                row, col = row + dr, col + dc
+                actions.append(names[(dr, dc)])
+                cells.append((row, col))
+        return (actions, cells)
+
+    def compute_distance_field(self):
+        """
+        Computes every open cell's distance to the goal with one reverse
+        breadth-first search, so solve_from() can answer from any start.
+        """
+        self.distances = {self.goal: 0}
+        queue = deque([self.goal])
+        while queue:
+            cell = queue.popleft()
+            for _, neighbor in self.neighbors(cell):
+                if neighbor not in self.distances:
+                    self.distances[neighbor] = self.distances[cell] + 1
+                    queue.append(neighbor)
+
+    def distance_to_goal(self, cell):
+        """Returns a cell's distance to the goal from the distance field, or None."""
+        return self.distances.get(cell)
+
+    def solve_from(self, start=None):
+        """
+        Finds a shortest solution from `start` (by default the maze's start)
+        to the goal by descending the distance field, computing it first if
+        needed. Takes time proportional to the length of the solution;
+        num_explored counts the cells visited.
+        """
+        if self.distances is None:
+            self.compute_distance_field()
+
+        cell = self.start if start is None else start
+        distance = self.distance_to_goal(cell)
+        if distance is None:
+            raise Exception("no solution")
+
+        actions = []
+        cells = []
+        self.explored = {cell}
+        self.explored_order = [cell]
+        while distance > 0:
+            for action, neighbor in self.neighbors(cell):
+                if self.distance_to_goal(neighbor) == distance - 1:
+                    break
+            cell = neighbor
+            distance -= 1
+            actions.append(action)
+            cells.append(cell)
+            self.explored.add(cell)
+            self.explored_order.append(cell)
+
+        self.num_explored = len(self.explored)
+        self.solution = (actions, cells)
 
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
+    def output_image(self, filename, show_solution=True, show_explored=False):
+        import render
+        render.save_image(self, filename, show_solution, show_explored)
 
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
 
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
+class MazeProblem(search.Problem):
+    """A Maze as a search problem, with Manhattan distance as its heuristic"""
 
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
+    def __init__(self, maze):
+        self.maze = maze
 
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
+    def start(self):
+        return self.maze.start
 
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+    def is_goal(self, state):
+        return state == self.maze.goal
+
+    def neighbors(self, state):
+        return self.maze.neighbors(state)
+
+    def heuristic(self, state):
+        return abs(state[0] - self.maze.goal[0]) + abs(state[1] - self.maze.goal[1])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python maze.py maze.txt [strategy | jps | field]")
+
+    m = Maze(sys.argv[1])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    if len(sys.argv) == 2:
+        m.solve()
+    elif sys.argv[2] == "jps":
+        m.solve_jps()
+    elif sys.argv[2] == "field":
+        m.solve_from()
+    else:
+        print(m.search(sys.argv[2]))
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
@@ -0,0 +1,159 @@
+"""
+Fast maze image rendering
+
+Rather than drawing one rectangle per cell, each cell gets a colour code
+(wall, start, goal, solution, explored or empty) in a (height, width)
+array, the palette is looked up for every cell at once, and each cell is
+blown up to cell_size x cell_size pixels by block repetition, with a
+black border. Works with both Maze and GridMaze.
+
+    save_image      - the whole maze as one image (Maze.output_image)
+    save_tiles      - the maze split into a grid of images, for mazes too big for one
+    save_animation  - an animated GIF of the order cells were explored in; each frame
+                      only paints the cells explored since the last one
+"""
+
+import numpy as np
+
+# Colour codes, in increasing order of precedence
+EMPTY, EXPLORED, SOLUTION, GOAL, START, WALL = range(6)
+
+PALETTE = np.array([
+    (237, 240, 252),  # Empty cell
+    (212, 97, 85),    # Explored
+    (220, 235, 113),  # Solution
+    (0, 171, 28),     # Goal
+    (255, 0, 0),      # Start
+    (40, 40, 40)      # Walls
+], dtype=np.uint8)
+
+CELL_SIZE = 50
+CELL_BORDER = 2
+
+# Cells per side of each image written by save_tiles
+TILE_CELLS = 256
+
+
+def cell_colors(maze, show_solution=True, show_explored=False):
+    """
+    Returns a (height, width) array of each cell's colour code.
+    As in Maze.output_image, explored cells are only shown once solved.
+    """
+    codes = np.full((maze.height, maze.width), EMPTY, dtype=np.uint8)
+    solved = maze.solution is not None
+
+    if solved and show_explored:
+        rows, cols = cells_array(maze.explored)
+        codes[rows, cols] = EXPLORED
+    if solved and show_solution:
+        rows, cols = cells_array(maze.solution[1])
+        codes[rows, cols] = SOLUTION
+    codes[maze.goal] = GOAL
+    codes[maze.start] = START
+    codes[np.asarray(maze.walls, dtype=bool)] = WALL
+    return codes
+
+
+def cells_array(cells):
+    """
+    Returns (rows, cols) index arrays for a collection of (row, col) cells,
+    or for a GridMaze CellMask.
+    """
+    if hasattr(cells, "mask"):
+        return np.nonzero(cells.mask)
+    cells = np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+    return cells[:, 0], cells[:, 1]
+
+
+def cell_mask(cell_size=CELL_SIZE, cell_border=CELL_BORDER):
+    """
+    Returns the (cell_size, cell_size) mask of a cell's coloured pixels:
+    everything but the border, matching ImageDraw.rectangle's inclusive corners.
+    """
+    pixels = np.arange(cell_size)
+    inside = (pixels >= cell_border) & (pixels <= cell_size - cell_border)
+    return inside[:, None] & inside[None, :]
+
+
+def upscale(codes, cell_size=CELL_SIZE, cell_border=CELL_BORDER):
+    """
+    Returns the RGB image (a uint8 array) for an array of colour codes,
+    each cell repeated into a cell_size x cell_size block.
+    """
+    height, width = codes.shape
+    mask = cell_mask(cell_size, cell_border)
+    image = np.zeros((height, cell_size, width, cell_size, 3), dtype=np.uint8)
+    image[:] = PALETTE[codes][:, None, :, None, :]
+    image *= mask[None, :, None, :, None]
+    return image.reshape(height * cell_size, width * cell_size, 3)
+
+
+def save_image(maze, filename, show_solution=True, show_explored=False, cell_size=CELL_SIZE):
+    from PIL import Image
+    codes = cell_colors(maze, show_solution, show_explored)
+    Image.fromarray(upscale(codes, cell_size)).save(filename)
+
+
+def save_tiles(maze, prefix, show_solution=True, show_explored=False,
+               cell_size=CELL_SIZE, tile_cells=TILE_CELLS):
+    """
+    Saves the maze as a grid of PNG images of at most tile_cells x tile_cells
+    cells each, named {prefix}_{tile row}_{tile column}.png, so that only one
+    tile's pixels are held at a time. Returns the filenames written.
+    """
+    from PIL import Image
+    codes = cell_colors(maze, show_solution, show_explored)
+    filenames = []
+    for tile_row, top in enumerate(range(0, maze.height, tile_cells)):
+        for tile_col, left in enumerate(range(0, maze.width, tile_cells)):
+            tile = codes[top:top + tile_cells, left:left + tile_cells]
+            filename = f"{prefix}_{tile_row}_{tile_col}.png"
+            Image.fromarray(upscale(tile, cell_size)).save(filename)
+            filenames.append(filename)
+    return filenames
+
+
+def save_animation(maze, filename, frames=50, cell_size=CELL_SIZE, duration=100):
+    """
+    Saves an animated GIF of a solved maze being explored: the maze with
+    start and goal, then `frames` steps through the explored cells in the
+    order they were explored, then the solution. The image is rendered
+    once; each frame only paints the blocks of the cells explored since
+    the previous frame.
+    """
+    from PIL import Image
+    if maze.solution is None:
+        raise Exception("maze must be solved before animating")
+
+    codes = cell_colors(maze, show_solution=False, show_explored=False)
+    image = upscale(codes, cell_size)
+    mask = cell_mask(cell_size)
+    images = [Image.fromarray(image)]
+
+    def paint(rows, cols, code):
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            if codes[row, col] in (START, GOAL, WALL):
+                continue
+            block = image[row * cell_size:(row + 1) * cell_size, col * cell_size:(col + 1) * cell_size]
+            block[mask] = PALETTE[code]
+
+    rows, cols = explored_order(maze)
+    for step in np.array_split(np.arange(len(rows)), min(frames, max(len(rows), 1))):
+        paint(rows[step], cols[step], EXPLORED)
+        images.append(Image.fromarray(image))
+
+    paint(*cells_array(maze.solution[1]), SOLUTION)
+    images.append(Image.fromarray(image))
+
+    images[0].save(filename, save_all=True, append_images=images[1:], duration=duration, loop=0)
+
+
+def explored_order(maze):
+    """
+    Returns (rows, cols) arrays of explored cells in the order the last
+    solver explored them.
+    """
+    order = maze.explored_order
+    if isinstance(order, np.ndarray):
+        return np.divmod(order, maze.width)
+    return cells_array(order)
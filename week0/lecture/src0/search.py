@@ -0,0 +1,281 @@
+"""
+Pluggable search engine
+
+Search strategies over any problem that subclasses Problem:
+
+    bfs      - breadth-first search (fewest actions)
+    dfs      - depth-first search
+    ucs      - uniform-cost search (cheapest path), binary heap frontier
+    astar    - A* search with the problem's heuristic, binary heap frontier
+    ida_star - iterative-deepening A*, memory linear in the path length
+
+Each run returns a Result carrying the solution (if any) and instrumentation:
+nodes expanded, peak frontier size and wall time, so strategies can be
+compared on the same problem. This module is self-contained: maze.py
+imports it from here, and degrees.py adds this directory to its path.
+"""
+
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+
+
+class Problem():
+    """
+    A search problem. Subclasses override start, is_goal and neighbors,
+    and optionally cost and heuristic.
+    """
+
+    def start(self):
+        """Returns the initial state."""
+        raise NotImplementedError
+
+    def is_goal(self, state):
+        """Returns True if `state` is a goal state."""
+        raise NotImplementedError
+
+    def neighbors(self, state):
+        """Returns (action, state) pairs reachable from `state` in one step."""
+        raise NotImplementedError
+
+    def cost(self, state, action, next_state):
+        """Returns the cost of taking `action` from `state` to `next_state`."""
+        return 1
+
+    def heuristic(self, state):
+        """Returns an admissible estimate of the cost from `state` to a goal."""
+        return 0
+
+
+class Result():
+    """
+    Outcome of a search: the solution, if one was found, and instrumentation.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+
+        # Solution: actions taken and states visited after the start, and total cost
+        self.actions = None
+        self.states = None
+        self.cost = None
+
+        # Instrumentation; explored is a dict of state -> None, so it keeps
+        # the order states were expanded in. ida_star leaves it empty, as
+        # keeping every state it visits would cost the memory it exists to save
+        self.explored = {}
+        self.nodes_expanded = 0
+        self.peak_frontier = 0
+        self.wall_time = 0.0
+
+    @property
+    def found(self):
+        return self.actions is not None
+
+    def __repr__(self):
+        cost = "no solution" if not self.found else f"cost {self.cost}"
+        return (f"{self.strategy}: {cost}, {self.nodes_expanded} expanded, "
+                f"peak frontier {self.peak_frontier}, {self.wall_time * 1000:.2f} ms")
+
+
+def bfs(problem):
+    """Breadth-first search: a first-in first-out frontier."""
+    return first_found(problem, Result("bfs"), deque.popleft)
+
+
+def dfs(problem):
+    """Depth-first search: a last-in first-out frontier."""
+    return first_found(problem, Result("dfs"), deque.pop)
+
+
+def first_found(problem, result, remove):
+    """
+    Graph search that stops at the first goal it generates, taking nodes
+    from the frontier with `remove`. Returns `result`, filled in.
+    """
+    started = time.perf_counter()
+    start = problem.start()
+    parents = {start: None}
+    frontier = deque([start])
+
+    if problem.is_goal(start):
+        goal = start
+    else:
+        goal = None
+
+    while frontier and goal is None:
+        result.peak_frontier = max(result.peak_frontier, len(frontier))
+        state = remove(frontier)
+        result.nodes_expanded += 1
+        result.explored[state] = None
+
+        for action, next_state in problem.neighbors(state):
+            if next_state in parents:
+                continue
+            parents[next_state] = (state, action)
+            if problem.is_goal(next_state):
+                goal = next_state
+                break
+            frontier.append(next_state)
+
+    if goal is not None:
+        solution(problem, result, parents, goal)
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def ucs(problem):
+    """Uniform-cost search: expands the cheapest path first."""
+    return best_first(problem, Result("ucs"), lambda state: 0)
+
+
+def astar(problem):
+    """A* search: expands the lowest cost plus heuristic first."""
+    return best_first(problem, Result("astar"), problem.heuristic)
+
+
+def best_first(problem, result, heuristic):
+    """
+    Best-first search on a binary heap of (cost + heuristic, tie, state).
+    Entries made stale by a cheaper path are skipped when popped.
+    Returns `result`, filled in.
+    """
+    started = time.perf_counter()
+    start = problem.start()
+    parents = {start: None}
+    costs = {start: 0}
+    tie = itertools.count()
+    frontier = [(heuristic(start), next(tie), start)]
+
+    goal = None
+    while frontier:
+        result.peak_frontier = max(result.peak_frontier, len(frontier))
+        _, _, state = heapq.heappop(frontier)
+        if state in result.explored:
+            continue
+        if problem.is_goal(state):
+            goal = state
+            break
+        result.nodes_expanded += 1
+        result.explored[state] = None
+
+        for action, next_state in problem.neighbors(state):
+            cost = costs[state] + problem.cost(state, action, next_state)
+            if next_state in result.explored or cost >= costs.get(next_state, math.inf):
+                continue
+            costs[next_state] = cost
+            parents[next_state] = (state, action)
+            heapq.heappush(frontier, (cost + heuristic(next_state), next(tie), next_state))
+
+    if goal is not None:
+        solution(problem, result, parents, goal)
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def ida_star(problem):
+    """
+    Iterative-deepening A*: repeated depth-first searches, each bounded by
+    cost + heuristic, raising the bound to the smallest value that exceeded it.
+    """
+    result = Result("ida_star")
+    started = time.perf_counter()
+    start = problem.start()
+    bound = problem.heuristic(start)
+
+    while True:
+        # Explicit stack of (state, cost, neighbour iterator), with the
+        # states on the current path, so long paths don't hit recursion limits
+        path = [start]
+        on_path = {start}
+        actions = []
+        stack = [(start, 0, iter(problem.neighbors(start)))]
+        next_bound = math.inf
+        result.nodes_expanded += 1
+
+        if problem.is_goal(start):
+            result.actions, result.states, result.cost = [], [], 0
+            break
+
+        found = False
+        while stack and not found:
+            result.peak_frontier = max(result.peak_frontier, len(stack))
+            state, cost, neighbors = stack[-1]
+            for action, next_state in neighbors:
+                if next_state in on_path:
+                    continue
+                next_cost = cost + problem.cost(state, action, next_state)
+                estimate = next_cost + problem.heuristic(next_state)
+                if estimate > bound:
+                    next_bound = min(next_bound, estimate)
+                    continue
+
+                path.append(next_state)
+                on_path.add(next_state)
+                actions.append(action)
+                if problem.is_goal(next_state):
+                    result.actions, result.states, result.cost = actions, path[1:], next_cost
+                    found = True
+                    break
+                result.nodes_expanded += 1
+                stack.append((next_state, next_cost, iter(problem.neighbors(next_state))))
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+                if actions:
+                    actions.pop()
+
+        if found or next_bound == math.inf:
+            break
+        bound = next_bound
+
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def solution(problem, result, parents, goal):
+    """
+    Fills in `result` with the path to `goal`, following `parents`
+    (state -> (parent state, action)) back to the start.
+    """
+    actions, states = [], []
+    cost = 0
+    state = goal
+    while parents[state] is not None:
+        parent, action = parents[state]
+        actions.append(action)
+        states.append(state)
+        cost += problem.cost(parent, action, state)
+        state = parent
+    actions.reverse()
+    states.reverse()
+    result.actions, result.states, result.cost = actions, states, cost
+
+
+STRATEGIES = {
+    "bfs": bfs,
+    "dfs": dfs,
+    "ucs": ucs,
+    "astar": astar,
+    "ida_star": ida_star
+}
+
+
+def search(problem, strategy="bfs"):
+    """Solves `problem` with the named strategy, returning a Result."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy}, expected one of {', '.join(STRATEGIES)}")
+    return STRATEGIES[strategy](problem)
+
+
+def compare(problem, strategies=STRATEGIES):
+    """Solves `problem` with each strategy, printing and returning the Results."""
+    results = []
+    for strategy in strategies:
+        result = search(problem, strategy)
+        print(result)
+        results.append(result)
+    return results
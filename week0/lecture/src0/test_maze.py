@@ -0,0 +1,202 @@
+import os
+
+import numpy as np
+import pytest
+
+import render
+from gridmaze import GridMaze, generate
+from maze import *
+from search import STRATEGIES
+
+DIRECTORY = os.path.dirname(__file__)
+MAZES = ["maze1.txt", "maze2.txt", "maze3.txt"]
+
+
+def load(filename):
+    return Maze(os.path.join(DIRECTORY, filename))
+
+
+@pytest.mark.parametrize("filename", MAZES)
+def test_search_strategies(filename):
+    """
+    GIVEN   a maze
+    WHEN    it is searched with each search module strategy
+    THEN    every strategy reaches the goal, and all but dfs match the length of Maze.solve(),
+            and all but ida_star record the states they explored, in order
+    """
+    maze = load(filename)
+    maze.solve()
+    expected = len(maze.solution[0])
+
+    for strategy in STRATEGIES:
+        maze = load(filename)
+        result = maze.search(strategy)
+        actions, cells = maze.solution
+        assert cells[-1] == maze.goal
+        assert maze.num_explored == result.nodes_expanded
+        if strategy == "dfs":
+            assert len(actions) >= expected
+        else:
+            assert len(actions) == expected
+        assert bool(result.explored) == (strategy != "ida_star")
+        assert maze.explored_order == list(result.explored)
+        if result.explored:
+            assert maze.explored_order[0] == maze.start
+
+
+@pytest.mark.parametrize("filename", MAZES)
+def test_grid_maze(filename):
+    """
+    GIVEN   a maze file
+    WHEN    it is loaded and solved with both Maze and GridMaze
+    THEN    both find the same walls, start, goal and solution length
+    """
+    maze = load(filename)
+    grid = GridMaze(os.path.join(DIRECTORY, filename))
+
+    assert (grid.height, grid.width) == (maze.height, maze.width)
+    assert (grid.start, grid.goal) == (maze.start, maze.goal)
+    assert grid.walls.tolist() == maze.walls
+    for i in range(maze.height):
+        for j in range(maze.width):
+            assert grid.neighbors((i, j)) == maze.neighbors((i, j))
+
+    maze.solve()
+    grid.solve()
+    assert len(grid.solution[0]) == len(maze.solution[0])
+    assert grid.solution[1][-1] == maze.goal
+    assert set(grid.explored) <= {(i, j) for i in range(maze.height) for j in range(maze.width)
+                                  if not maze.walls[i][j]}
+
+
+def test_generated_maze(tmp_path):
+    """
+    GIVEN   a generated maze
+    WHEN    it is solved with GridMaze
+    THEN    the solution is a connected path of open cells from start to goal
+    """
+    filename = tmp_path / "maze.txt"
+    filename.write_text(generate(30, 40, seed=1))
+    grid = GridMaze(filename)
+    grid.solve()
+
+    walls = grid.walls
+    cell = grid.start
+    for action, next_cell in zip(*grid.solution):
+        assert (action, next_cell) in grid.neighbors(cell)
+        assert not walls[next_cell]
+        cell = next_cell
+    assert cell == grid.goal
+
+    maze = Maze(filename)
+    maze.solve()
+    assert len(maze.solution[0]) == len(grid.solution[0])
+
+
+OPEN_MAZE = """\
+A     #     
+  ##  #  #  
+  #      #  
+  #  ####   
+     #     B
+"""
+
+
+@pytest.mark.parametrize("maze_class", [Maze, GridMaze])
+@pytest.mark.parametrize("filename", MAZES + ["open"])
+def test_jump_point_search(maze_class, filename, tmp_path):
+    """
+    GIVEN   a maze
+    WHEN    it is solved with solve_jps() and with solve_from() on the distance field
+    THEN    both give a connected shortest path, JPS expanding no more cells than BFS
+            and the descent visiting only the cells on its path
+    """
+    if filename == "open":
+        filename = tmp_path / "open.txt"
+        filename.write_text(OPEN_MAZE)
+    path = os.path.join(DIRECTORY, filename)
+
+    bfs = maze_class(path)
+    bfs.solve()
+
+    for solve in ["solve_jps", "solve_from"]:
+        maze = maze_class(path)
+        getattr(maze, solve)()
+        actions, cells = maze.solution
+        assert len(actions) == len(bfs.solution[0])
+        if solve == "solve_jps":
+            assert maze.num_explored <= bfs.num_explored
+        else:
+            assert maze.num_explored == len(actions) + 1
+
+        cell = maze.start
+        for action, next_cell in zip(actions, cells):
+            assert (action, next_cell) in maze.neighbors(cell)
+            cell = next_cell
+        assert cell == maze.goal
+
+
+def test_distance_field_queries():
+    """
+    GIVEN   a maze with a computed distance field
+    WHEN    solve_from() is called from every open cell
+    THEN    each solution is as long as that cell's distance to the goal
+    """
+    maze = load("maze2.txt")
+    grid = GridMaze(os.path.join(DIRECTORY, "maze2.txt"))
+    maze.compute_distance_field()
+    grid.compute_distance_field()
+
+    for i in range(maze.height):
+        for j in range(maze.width):
+            if maze.walls[i][j]:
+                continue
+            assert maze.distance_to_goal((i, j)) == grid.distance_to_goal((i, j))
+            if maze.distance_to_goal((i, j)) is None:
+                with pytest.raises(Exception):
+                    maze.solve_from((i, j))
+                continue
+            maze.solve_from((i, j))
+            assert len(maze.solution[0]) == maze.distance_to_goal((i, j))
+
+
+def test_render(tmp_path):
+    """
+    GIVEN   a maze solved by Maze and by GridMaze
+    WHEN    it is rendered whole, in tiles, and as an animation
+    THEN    both backends give the same image, the tiles put back together give the
+            whole image, and the animation has one frame per step plus the first and last
+    """
+    from PIL import Image
+    path = os.path.join(DIRECTORY, "maze2.txt")
+    maze = Maze(path)
+    grid = GridMaze(path)
+    maze.solve()
+    grid.solve()
+
+    maze.output_image(tmp_path / "maze.png", show_explored=True)
+    grid.output_image(tmp_path / "grid.png", show_explored=True)
+    whole = np.array(Image.open(tmp_path / "maze.png"))
+    assert whole.shape == (maze.height * render.CELL_SIZE, maze.width * render.CELL_SIZE, 3)
+    assert (whole == np.array(Image.open(tmp_path / "grid.png"))).all()
+    assert tuple(whole[maze.start[0] * 50 + 25, maze.start[1] * 50 + 25]) == (255, 0, 0)
+    assert tuple(whole[0, 0]) == (0, 0, 0)
+
+    filenames = render.save_tiles(maze, str(tmp_path / "tile"), show_explored=True, tile_cells=5)
+    tile_rows, tile_cols = -(-maze.height // 5), -(-maze.width // 5)
+    assert len(filenames) == tile_rows * tile_cols
+    tiles = [[np.array(Image.open(tmp_path / f"tile_{r}_{c}.png")) for c in range(tile_cols)]
+             for r in range(tile_rows)]
+    assert (np.concatenate([np.concatenate(row, axis=1) for row in tiles], axis=0) == whole).all()
+
+    for solved in [maze, grid]:
+        render.save_animation(solved, tmp_path / "explore.gif", frames=10, cell_size=10)
+        assert Image.open(tmp_path / "explore.gif").n_frames == 12
+
+    # Every solver leaves something to animate, in expansion order where it knows it
+    for solve in [maze.search, maze.solve_jps, maze.solve_from, grid.solve_jps]:
+        solve()
+        rows, cols = render.explored_order(solve.__self__)
+        assert set(zip(rows.tolist(), cols.tolist())) == set(solve.__self__.explored)
+        render.save_animation(solve.__self__, tmp_path / "explore.gif", frames=10, cell_size=10)
+    assert render.explored_order(maze)[0][0] == maze.start[0]
@@ -0,0 +1,165 @@
+"""
+Batch degrees-of-separation queries
+
+Answers a whole file of queries from a single loaded graph, streaming one
+JSON object per query to standard output as results become available.
+
+    python batch.py directory queries.csv
+        each row of queries.csv is a "source,target" pair
+
+    python batch.py directory queries.csv source
+        each row of queries.csv is a single target, all from `source`
+
+People can be given by name or by IMDb person ID. Queries that share a
+source are answered from one breadth-first search tree. Independent
+sources are spread over a process pool; the CSR arrays of the graph are
+placed in shared memory once, so workers don't each hold a copy.
+"""
+
+import csv
+import json
+import sys
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from graph import StarGraph, index_path
+from snapshot import load_cached_graph
+
+CSR_ARRAYS = ["person_indptr", "person_movies", "movie_indptr", "movie_people"]
+
+# Graph and shared memory blocks attached to by each pool worker
+worker_graph = None
+worker_blocks = []
+
+
+def main():
+    if len(sys.argv) not in [3, 4]:
+        sys.exit("Usage: python batch.py directory queries.csv [source]")
+    directory = sys.argv[1]
+
+    graph = load_cached_graph(directory)
+    with open(sys.argv[2], encoding="utf-8") as f:
+        rows = [row for row in csv.reader(f) if row]
+    if len(sys.argv) == 4:
+        queries = [(sys.argv[3], row[0]) for row in rows]
+    else:
+        queries = [(row[0], row[1]) for row in rows]
+
+    for record in run_queries(graph, queries):
+        print(json.dumps(record), flush=True)
+
+
+def run_queries(graph, queries, processes=None):
+    """
+    Answers a list of (source, target) queries, yielding one result dict
+    per query. Results are yielded as each source's search completes, so
+    they are not necessarily in input order: each carries its `index`.
+    """
+    # Group queries by source, so each source is searched only once
+    groups = {}
+    for index, (source, target) in enumerate(queries):
+        try:
+            source_index, target_index = resolve(graph, source), resolve(graph, target)
+        except LookupError as e:
+            yield {"index": index, "source": source, "target": target, "error": str(e)}
+            continue
+        groups.setdefault(source_index, []).append((index, target_index))
+
+    tasks = list(groups.items())
+    if len(tasks) <= 1 or processes == 1:
+        attach(graph)
+        for answers in map(search, tasks):
+            yield from records(graph, queries, answers)
+        return
+
+    blocks, specs = share_arrays(graph)
+    try:
+        with Pool(processes, initializer=attach_shared, initargs=(specs,)) as pool:
+            for answers in pool.imap_unordered(search, tasks):
+                yield from records(graph, queries, answers)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def resolve(graph, person):
+    """
+    Returns the person index for a person ID or an unambiguous name.
+    """
+    if person in graph.person_index:
+        return graph.person_index[person]
+    person_ids = graph.names.get(person.lower(), set())
+    if len(person_ids) == 0:
+        raise LookupError(f"Person not found: {person}")
+    if len(person_ids) > 1:
+        raise LookupError(f"Ambiguous name: {person} (IDs: {', '.join(sorted(person_ids))})")
+    return graph.person_index[next(iter(person_ids))]
+
+
+def search(task):
+    """
+    Runs one breadth-first search from a source to all of its targets.
+    Returns a list of (query index, source, target, path of index pairs).
+    """
+    source, targets = task
+    parent_movie, parent_person = worker_graph.bfs(source, [target for _, target in targets])
+    return [(index, source, target, index_path(parent_movie, parent_person, source, target))
+            for index, target in targets]
+
+
+def records(graph, queries, answers):
+    """
+    Converts search answers into JSON-serialisable result dicts.
+    """
+    for index, source, target, path in answers:
+        record = {"index": index, "source": queries[index][0], "target": queries[index][1]}
+        if path is None:
+            record["degrees"] = None
+        else:
+            record["degrees"] = len(path)
+            record["path"] = [{
+                "movie_id": graph.movie_ids[movie],
+                "title": graph.movie_titles[movie],
+                "person_id": graph.person_ids[person],
+                "name": graph.person_names[person]
+            } for movie, person in path]
+        yield record
+
+
+def attach(graph):
+    global worker_graph
+    worker_graph = graph
+
+
+def share_arrays(graph):
+    """
+    Copies the CSR arrays of `graph` into shared memory blocks.
+    Returns the blocks, and the (name, shape, dtype) spec of each array.
+    """
+    blocks, specs = [], {}
+    for name in CSR_ARRAYS:
+        array = np.ascontiguousarray(getattr(graph, name))
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def attach_shared(specs):
+    """
+    Pool worker initializer: builds a graph over the shared CSR arrays.
+    Workers only search, so they don't need the string tables.
+    """
+    arrays = {}
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        worker_blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    attach(StarGraph(None, None, None, None, None, None, **arrays))
+
+
+if __name__ == "__main__":
+    main()
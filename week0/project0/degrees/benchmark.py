@@ -0,0 +1,90 @@
+"""
+Breadth-first search benchmark for the frontiers in util.py
+
+Runs BFS over synthetic graphs of 10^5 - 10^6 nodes, the scale of the IMDb
+"large" dataset, and reports nodes explored and wall time per frontier.
+
+Usage: python benchmark.py [nodes ...]
+"""
+
+import random
+import sys
+import time
+
+from util import Node, QueueFrontier, HashedQueueFrontier
+
+# Default graph sizes (number of nodes)
+SIZES = [100_000, 1_000_000]
+
+# Average number of neighbours per node
+DEGREE = 4
+
+# The list-backed QueueFrontier is quadratic, so only run it on small graphs
+LEGACY_LIMIT = 20_000
+
+
+def synthetic_graph(n, degree=DEGREE, seed=0):
+    """
+    Returns adjacency lists for a connected graph of `n` nodes:
+    a ring, plus random chords until the average degree is reached.
+    """
+    rng = random.Random(seed)
+    graph = [[(i - 1) % n, (i + 1) % n] for i in range(n)]
+    for _ in range(n * (degree - 2) // 2):
+        a = rng.randrange(n)
+        b = rng.randrange(n)
+        graph[a].append(b)
+        graph[b].append(a)
+    return graph
+
+
+def bfs(graph, source, target, frontier_class):
+    """
+    Breadth-first search from `source` to `target`, mirroring the loop in
+    degrees.shortest_path. Returns (path length, number of nodes explored).
+    """
+    frontier = frontier_class()
+    frontier.add(Node(state=source, parent=None, action=None))
+    explored = set()
+
+    while not frontier.empty():
+        node = frontier.remove()
+        explored.add(node.state)
+        for state in graph[node.state]:
+            if not frontier.contains_state(state) and state not in explored:
+                child = Node(state=state, parent=node, action=None)
+                if state == target:
+                    length = 0
+                    while child.parent is not None:
+                        length += 1
+                        child = child.parent
+                    return length, len(explored)
+                frontier.add(child)
+
+    return None, len(explored)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+
+    for n in sizes:
+        print(f"Building graph with {n} nodes...")
+        graph = synthetic_graph(n)
+
+        # The far side of the ring, so the search has to cover most of the graph
+        source, target = 0, n // 2
+
+        frontiers = [HashedQueueFrontier]
+        if n <= LEGACY_LIMIT:
+            frontiers.append(QueueFrontier)
+
+        for frontier_class in frontiers:
+            start = time.perf_counter()
+            length, explored = bfs(graph, source, target, frontier_class)
+            elapsed = time.perf_counter() - start
+            print(f"  {frontier_class.__name__}: path length {length}, "
+                  f"{explored} nodes explored in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
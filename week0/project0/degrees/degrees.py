@@ -6,13 +6,25 @@ https://cs50.harvard.edu/ai/2020/projects/0/degrees/
 """
 
 import csv
+import os
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+# The search strategies are the week 0 lecture's, shared rather than copied
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "..", "lecture", "src0"))
+
+import search
+from landmarks import load_landmarks
+from nameindex import NameIndex
+from snapshot import load_cached_graph
+from util import Node, HashedQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
 
+# Prefix and fuzzy search over names, built once data is loaded
+name_index = None
+
 # Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
 people = {}
 
@@ -58,25 +70,38 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    build_name_index()
+
+
+def build_name_index():
+    global name_index
+    name_index = NameIndex(names)
+
 
 def main():
     if len(sys.argv) > 2:
         sys.exit("Usage: python degrees.py [directory]")
     directory = sys.argv[1] if len(sys.argv) == 2 else "large"
 
-    # Load data from files into memory
+    # Map the graph from its snapshot, searched in place without building dicts
     print("Loading data...")
-    load_data(directory)
+    graph = load_cached_graph(directory)
     print("Data loaded.")
 
-    source = person_id_for_name(input("Name: "))
+    source = person_for_name(graph, input("Name: "))
     if source is None:
         sys.exit("Person not found.")
-    target = person_id_for_name(input("Name: "))
+    target = person_for_name(graph, input("Name: "))
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    # Prune the search with the landmark index, if one has been built,
+    # else search from both ends
+    landmarks = load_landmarks(directory, graph)
+    if landmarks is not None:
+        path = landmarks.index_path(source, target)
+    else:
+        path = graph.bidirectional_path(source, target)
 
     if path is None:
         print("Not connected.")
@@ -86,9 +111,9 @@ def main():
 
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = graph.person_names[path[i][1]]
+            person2 = graph.person_names[path[i + 1][1]]
+            movie = graph.movie_titles[path[i + 1][0]]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
@@ -101,7 +126,7 @@ def shortest_path(source: str, target: str):
     """
     # Start with a frontier that contains the initial state
     source_node: Node = Node(state=source, parent=None, action=neighbors_for_person(source))
-    frontier: QueueFrontier = QueueFrontier()  # Breadth-first search to guarantee shortest-path is found
+    frontier: HashedQueueFrontier = HashedQueueFrontier()  # Breadth-first search to guarantee shortest-path is found
     frontier.add(source_node)
 
     # Start with an empty explored set
@@ -141,6 +166,112 @@ def shortest_path(source: str, target: str):
                 frontier.add(child_node)
 
 
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching breadth-first
+    from both ends and meeting in the middle.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) step back towards
+    # the end of the search it was reached from, and its depth from that end
+    forward = {source: None}
+    backward = {target: None}
+    forward_depth = {source: 0}
+    backward_depth = {target: 0}
+    forward_layer = [source]
+    backward_layer = [target]
+
+    while forward_layer and backward_layer:
+
+        # Grow whichever side has the smaller layer by one full level
+        if len(forward_layer) <= len(backward_layer):
+            layer, parents, depth = forward_layer, forward, forward_depth
+            other_parents, other_depth = backward, backward_depth
+        else:
+            layer, parents, depth = backward_layer, backward, backward_depth
+            other_parents, other_depth = forward, forward_depth
+
+        next_layer = []
+        meeting = None
+        for person_id in layer:
+            for movie_id, neighbor_id in neighbors_for_person(person_id):
+                if neighbor_id in parents:
+                    continue
+                parents[neighbor_id] = (movie_id, person_id)
+                depth[neighbor_id] = depth[person_id] + 1
+                next_layer.append(neighbor_id)
+
+                # Finish the level so the closest meeting point is chosen
+                if neighbor_id in other_parents and (
+                        meeting is None or other_depth[neighbor_id] < other_depth[meeting]):
+                    meeting = neighbor_id
+
+        if meeting is not None:
+            return join_paths(forward, backward, meeting)
+
+        if layer is forward_layer:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+    return None
+
+
+def join_paths(forward, backward, meeting):
+    """
+    Joins the two halves of a bidirectional search that met at `meeting`
+    into a single list of (movie_id, person_id) pairs from source to target.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, previous_id = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = previous_id
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, next_id = backward[person_id]
+        path.append((movie_id, next_id))
+        person_id = next_id
+    return path
+
+
+class PersonProblem(search.Problem):
+    """Degrees of separation as a search problem over the loaded data"""
+
+    def __init__(self, source, target):
+        self.source = source
+        self.target = target
+
+    def start(self):
+        return self.source
+
+    def is_goal(self, state):
+        return state == self.target
+
+    def neighbors(self, state):
+        return neighbors_for_person(state)
+
+
+def search_path(source, target, strategy="bfs"):
+    """
+    Returns the list of (movie_id, person_id) pairs that connect the
+    source to the target found by a search module strategy, or None,
+    along with the search Result for comparing strategies.
+    """
+    result = search.search(PersonProblem(source, target), strategy)
+    if not result.found:
+        return None, result
+    return list(zip(result.actions, result.states)), result
+
+
 def get_path_to_source(node):
     path = []
 
@@ -162,6 +293,10 @@ def person_id_for_name(name):
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
+        if name_index is not None:
+            suggestions = [people[next(iter(ids))]["name"] for _, ids in name_index.fuzzy(name, k=5, max_distance=3)]
+            if suggestions:
+                print(f"Did you mean: {', '.join(suggestions)}?")
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
@@ -181,6 +316,38 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def person_for_name(graph, name):
+    """
+    Returns the person index in `graph` for a person's name,
+    resolving ambiguities as needed.
+    """
+    people = graph.people_named(name)
+    if len(people) == 0:
+        # Only a miss pays for building the fuzzy index over every name
+        suggestions = [graph.person_names[graph.people_named(match)[0]]
+                       for match, _ in NameIndex(graph.names).fuzzy(name, k=5, max_distance=3)]
+        if suggestions:
+            print(f"Did you mean: {', '.join(suggestions)}?")
+        return None
+    elif len(people) > 1:
+        print(f"Which '{name}'?")
+        for person in people:
+            person_id = graph.person_ids[person]
+            name = graph.person_names[person]
+            birth = graph.person_births[person]
+            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+        try:
+            person_id = input("Intended Person ID: ")
+            for person in people:
+                if graph.person_ids[person] == person_id:
+                    return person
+        except ValueError:
+            pass
+        return None
+    else:
+        return people[0]
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
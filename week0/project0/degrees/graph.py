@@ -0,0 +1,384 @@
+"""
+Compact star graph for degrees
+
+Person and movie IDs are interned to dense integers, and the bipartite
+person <-> movie star graph is stored as two CSR (compressed sparse row)
+adjacency structures in NumPy arrays: `indptr[i]:indptr[i + 1]` slices
+`indices` to give the neighbours of row i. Breadth-first search runs over
+whole levels of those arrays at a time, so no per-person sets are built.
+"""
+
+import csv
+from functools import cached_property
+
+import numpy as np
+
+
+class StarGraph():
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_indptr, person_movies, movie_indptr, movie_people,
+                 person_name_order=None):
+
+        # Interned string tables: index -> value
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+
+        # CSR adjacency: person -> movies, and movie -> people
+        self.person_indptr = person_indptr
+        self.person_movies = person_movies
+        self.movie_indptr = movie_indptr
+        self.movie_people = movie_people
+
+        # Person indices sorted by lower-cased name, if already known
+        if person_name_order is not None:
+            self.person_name_order = person_name_order
+
+    # Reverse lookups are built on first use, so a graph mapped from a
+    # snapshot doesn't pay for them unless it needs them
+
+    @cached_property
+    def person_index(self):
+        """Maps person IDs to person indices."""
+        return {person_id: i for i, person_id in enumerate(self.person_ids)}
+
+    @cached_property
+    def movie_index(self):
+        """Maps movie IDs to movie indices."""
+        return {movie_id: i for i, movie_id in enumerate(self.movie_ids)}
+
+    @cached_property
+    def names(self):
+        """Maps lower-cased names to a set of corresponding person IDs."""
+        names = {}
+        for person_id, name in zip(self.person_ids, self.person_names):
+            names.setdefault(name.lower(), set()).add(person_id)
+        return names
+
+    @cached_property
+    def person_name_order(self):
+        """Person indices sorted by lower-cased name, for binary search by name."""
+        return name_order(self.person_names)
+
+    def people_named(self, name):
+        """
+        Returns the person indices with a name (matched case-insensitively),
+        by binary search, so no name dict need be built.
+        """
+        name = name.lower()
+        order = self.person_name_order
+
+        def key(i):
+            return self.person_names[order[i]].lower()
+
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if key(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        people = []
+        while low < len(order) and key(low) == name:
+            people.append(int(order[low]))
+            low += 1
+        return people
+
+    @property
+    def num_people(self):
+        return len(self.person_indptr) - 1
+
+    @property
+    def num_movies(self):
+        return len(self.movie_indptr) - 1
+
+    def movies_for_person(self, person):
+        """Returns the movie indices a person (by index) starred in."""
+        return self.person_movies[self.person_indptr[person]:self.person_indptr[person + 1]]
+
+    def people_for_movie(self, movie):
+        """Returns the person indices who starred in a movie (by index)."""
+        return self.movie_people[self.movie_indptr[movie]:self.movie_indptr[movie + 1]]
+
+    def neighbors_for_person(self, person):
+        """
+        Returns (movie, person) index pairs for people
+        who starred with a given person (by index).
+        """
+        neighbors = set()
+        for movie in self.movies_for_person(person).tolist():
+            for other in self.people_for_movie(movie).tolist():
+                neighbors.add((movie, other))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target (both person IDs).
+
+        If no possible path, returns None.
+        """
+        path = self.index_shortest_path(self.person_index[source], self.person_index[target])
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person]) for movie, person in path]
+
+    def index_shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie, person) index pairs that
+        connect the source to the target (both person indices), or None.
+        """
+        parent_movie, parent_person = self.bfs(source, [target])
+        return index_path(parent_movie, parent_person, source, target)
+
+    def bidirectional_path(self, source, target):
+        """
+        Returns the shortest list of (movie, person) index pairs that connect
+        the source to the target (both person indices), or None, growing a
+        breadth-first search from each end a level at a time until they meet.
+
+        The side with the smaller last level grows next. Until the searches
+        meet, no path is shorter than their two depths added together, so any
+        person the level reaches that the other side reached already is on a
+        shortest path.
+        """
+        if source == target:
+            return []
+
+        sides = []
+        for start in (source, target):
+            reached = np.zeros(self.num_people, dtype=bool)
+            reached[start] = True
+            sides.append({
+                "layers": self.layers(start),
+                "reached": reached,
+                "parent_movie": np.full(self.num_people, -1, dtype=np.int32),
+                "parent_person": np.full(self.num_people, -1, dtype=np.int32),
+                "size": 1
+            })
+        forward, backward = sides
+
+        while True:
+            side, other = forward, backward
+            if forward["size"] > backward["size"]:
+                side, other = backward, forward
+            level = next(side["layers"], None)
+            if level is None:
+                return None
+            _, stars, via_movie, via_person = level
+            side["reached"][stars] = True
+            side["parent_movie"][stars] = via_movie
+            side["parent_person"][stars] = via_person
+            side["size"] = len(stars)
+
+            met = stars[other["reached"][stars]]
+            if len(met):
+                break
+
+        meeting = int(met[0])
+        path = index_path(forward["parent_movie"], forward["parent_person"], source, meeting)
+        person = meeting
+        while person != target:
+            next_person = int(backward["parent_person"][person])
+            path.append((int(backward["parent_movie"][person]), next_person))
+            person = next_person
+        return path
+
+    def bfs(self, source, targets=(), prune=None):
+        """
+        Breadth-first search from the person index `source`, a whole level at a time.
+
+        Returns (parent_movie, parent_person) arrays, indexed by person, giving
+        the step back towards the source for every reached person (-1 if
+        unreached). Stops after the level that reaches the last of `targets`,
+        if any are given, so one search can answer many queries from `source`.
+        `prune` is passed on to layers().
+        """
+        parent_movie = np.full(self.num_people, -1, dtype=np.int32)
+        parent_person = np.full(self.num_people, -1, dtype=np.int32)
+        reached = np.zeros(self.num_people, dtype=bool)
+        reached[source] = True
+        targets = np.asarray(targets, dtype=np.int64)
+
+        if len(targets) and reached[targets].all():
+            return parent_movie, parent_person
+
+        for _, stars, via_movie, via_person in self.layers(source, prune):
+            reached[stars] = True
+            parent_movie[stars] = via_movie
+            parent_person[stars] = via_person
+            if len(targets) and reached[targets].all():
+                break
+
+        return parent_movie, parent_person
+
+    def distances(self, source):
+        """
+        Returns an array of the degrees of separation of every person from
+        the person index `source`, with -1 for people who aren't connected.
+        """
+        distance = np.full(self.num_people, -1, dtype=np.int32)
+        distance[source] = 0
+        for depth, stars, _, _ in self.layers(source):
+            distance[stars] = depth
+        return distance
+
+    def layers(self, source, prune=None):
+        """
+        Generates the levels of a breadth-first search from the person index
+        `source`, as (depth, people, via_movie, via_person) where each newly
+        reached person was reached through via_movie, starring via_person.
+
+        If given, `prune(people, depth)` returns a mask of the people in a level
+        worth keeping; the rest are dropped and not expanded.
+        """
+        reached = np.zeros(self.num_people, dtype=bool)
+        movie_seen = np.zeros(self.num_movies, dtype=bool)
+
+        reached[source] = True
+        layer = np.array([source], dtype=np.int32)
+        depth = 0
+
+        while len(layer):
+            depth += 1
+
+            # Person -> movie: keep only movies not reached on an earlier level,
+            # since all of their stars have been reached already
+            people, films = expand(self.person_indptr, self.person_movies, layer)
+            films, first = np.unique(films, return_index=True)
+            people = people[first]
+            fresh = ~movie_seen[films]
+            films, people = films[fresh], people[fresh]
+            movie_seen[films] = True
+
+            # Movie -> person: keep only people not reached yet
+            via, stars = expand(self.movie_indptr, self.movie_people, films)
+            stars, first = np.unique(stars, return_index=True)
+            via = via[first]
+            fresh = ~reached[stars]
+            stars, via = stars[fresh], via[fresh]
+            if prune is not None:
+                keep = prune(stars, depth)
+                stars, via = stars[keep], via[keep]
+
+            reached[stars] = True
+            yield depth, stars, via, people[np.searchsorted(films, via)]
+            layer = stars
+
+    def path_to(self, parent_movie, parent_person, source, target):
+        """
+        Walks BFS parent arrays back from `target` to `source` (person indices),
+        returning a list of (movie_id, person_id) pairs, or None if unreached.
+        """
+        path = index_path(parent_movie, parent_person, source, target)
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person]) for movie, person in path]
+
+
+def index_path(parent_movie, parent_person, source, target):
+    """
+    Walks BFS parent arrays back from `target` to `source` (person indices),
+    returning a list of (movie, person) index pairs, or None if unreached.
+    """
+    if source == target:
+        return []
+    if parent_person[target] < 0:
+        return None
+
+    path = []
+    person = target
+    while person != source:
+        path.append((int(parent_movie[person]), int(person)))
+        person = parent_person[person]
+    path.reverse()
+    return path
+
+
+def name_order(names):
+    """Returns the indices of a list of names, sorted by lower-cased name."""
+    names = [name.lower() for name in names]
+    return np.array(sorted(range(len(names)), key=names.__getitem__), dtype=np.int32)
+
+
+def expand(indptr, indices, rows):
+    """
+    Returns (rows, neighbours) arrays listing every CSR edge out of `rows`,
+    with each row repeated once per edge.
+    """
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(rows, counts), indices[np.repeat(starts, counts) + offsets]
+
+
+def csr(rows, cols, num_rows):
+    """
+    Builds (indptr, indices) CSR arrays for the edges rows[i] -> cols[i].
+    """
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32)
+
+
+def load_graph(directory):
+    """
+    Load data from CSV files into a StarGraph.
+    """
+    person_ids, person_names, person_births = [], [], []
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            person_ids.append(row["id"])
+            person_names.append(row["name"])
+            person_births.append(row["birth"])
+
+    movie_ids, movie_titles, movie_years = [], [], []
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            movie_ids.append(row["id"])
+            movie_titles.append(row["title"])
+            movie_years.append(row["year"])
+
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+    # Intern star rows to person and movie indices, skipping unknown IDs
+    people, films = [], []
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                person, movie = person_index[row["person_id"]], movie_index[row["movie_id"]]
+            except KeyError:
+                continue
+            people.append(person)
+            films.append(movie)
+
+    return graph_from_edges(person_ids, person_names, person_births,
+                            movie_ids, movie_titles, movie_years,
+                            np.array(people, dtype=np.int32), np.array(films, dtype=np.int32))
+
+
+def graph_from_edges(person_ids, person_names, person_births,
+                     movie_ids, movie_titles, movie_years, people, films):
+    """
+    Builds a StarGraph from string tables and parallel arrays of
+    (person, movie) index pairs, dropping duplicate pairs.
+    """
+    stride = max(len(movie_ids), 1)
+    keys = np.unique(people.astype(np.int64) * stride + films)
+    people = (keys // stride).astype(np.int32)
+    films = (keys % stride).astype(np.int32)
+    person_indptr, person_movies = csr(people, films, len(person_ids))
+    movie_indptr, movie_people = csr(films, people, len(movie_ids))
+    return StarGraph(person_ids, person_names, person_births,
+                     movie_ids, movie_titles, movie_years,
+                     person_indptr, person_movies, movie_indptr, movie_people)
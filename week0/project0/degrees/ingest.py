@@ -0,0 +1,232 @@
+"""
+Streaming ingestion of the degrees data into a snapshot
+
+For datasets whose star list doesn't fit in memory. stars.csv is read in
+blocks of `chunk_size` rows; each block is interned to integer
+(person, movie) pairs, orphan rows are dropped (as load_data's
+`except KeyError: pass` does), and the pairs are sorted into two run files
+on disk: one keyed person-major, one movie-major. The runs are then merged
+externally, a bounded block at a time, straight into the memory-mapped CSR
+arrays of a snapshot that snapshot.read_snapshot can map. With more runs
+than MERGE_FAN_IN (or than keys in a block), groups of runs are first
+merged into longer runs, as many passes as it takes.
+
+Memory use is bounded by `chunk_size` edges, plus the people and movie
+tables (which the snapshot's string tables and ID lookups need anyway).
+
+Usage: python ingest.py directory [chunk_size]
+"""
+
+import csv
+import itertools
+import os
+import sys
+import tempfile
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from graph import name_order
+from snapshot import clear_snapshot, write_manifest, write_strings
+
+# Number of stars.csv rows held in memory at once
+CHUNK_SIZE = 1_000_000
+
+# Most runs merged in one pass, so each run's share of a merge block
+# stays large enough to read efficiently
+MERGE_FAN_IN = 64
+
+
+def ingest(directory, chunk_size=CHUNK_SIZE):
+    """
+    Writes the snapshot for the CSV files in `directory`,
+    streaming stars.csv through sorted runs on disk.
+    """
+    person_ids, person_names, person_births = read_table(
+        f"{directory}/people.csv", ["id", "name", "birth"])
+    movie_ids, movie_titles, movie_years = read_table(
+        f"{directory}/movies.csv", ["id", "title", "year"])
+    num_people, num_movies = len(person_ids), len(movie_ids)
+
+    path = clear_snapshot(directory)
+    with tempfile.TemporaryDirectory(dir=path) as scratch:
+        person_runs, movie_runs = write_runs(
+            f"{directory}/stars.csv", scratch, chunk_size,
+            {person_id: i for i, person_id in enumerate(person_ids)},
+            {movie_id: i for i, movie_id in enumerate(movie_ids)})
+
+        # Person-major keys are person * num_movies + movie, and vice versa
+        write_csr(path, "person_indptr", "person_movies",
+                  merge_runs(person_runs, chunk_size, scratch),
+                  num_people, max(num_movies, 1), scratch, chunk_size)
+        write_csr(path, "movie_indptr", "movie_people",
+                  merge_runs(movie_runs, chunk_size, scratch),
+                  num_movies, max(num_people, 1), scratch, chunk_size)
+
+    for name, strings in [("person_ids", person_ids), ("person_names", person_names),
+                          ("person_births", person_births), ("movie_ids", movie_ids),
+                          ("movie_titles", movie_titles), ("movie_years", movie_years)]:
+        write_strings(path, name, strings)
+    np.save(os.path.join(path, "person_name_order.npy"), name_order(person_names))
+    write_manifest(path, directory)
+
+
+def read_table(filename, columns):
+    """
+    Reads the given columns of a CSV file into one list per column.
+    """
+    table = [[] for _ in columns]
+    with open(filename, encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            for values, column in zip(table, columns):
+                values.append(row[column])
+    return table
+
+
+def write_runs(filename, scratch, chunk_size, person_index, movie_index):
+    """
+    Streams stars.csv in blocks of `chunk_size` rows, writing each block's
+    (person, movie) pairs as a sorted person-major and a sorted movie-major
+    run file of raw int64 keys in `scratch`. Returns the two lists of run
+    file names.
+    """
+    num_people = max(len(person_index), 1)
+    num_movies = max(len(movie_index), 1)
+    person_runs, movie_runs = [], []
+
+    with open(filename, encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+
+            people, films = [], []
+            for row in rows:
+                try:
+                    person, movie = person_index[row["person_id"]], movie_index[row["movie_id"]]
+                except KeyError:
+                    continue
+                people.append(person)
+                films.append(movie)
+            if not people:
+                continue
+
+            people = np.array(people, dtype=np.int64)
+            films = np.array(films, dtype=np.int64)
+            for runs, keys in [(person_runs, people * num_movies + films),
+                               (movie_runs, films * num_people + people)]:
+                run = os.path.join(scratch, f"run{len(person_runs) + len(movie_runs)}.bin")
+                np.unique(keys).tofile(run)
+                runs.append(run)
+
+    return person_runs, movie_runs
+
+
+def merge_runs(runs, block_size, scratch):
+    """
+    Merges sorted run files, yielding sorted blocks of distinct keys.
+    At most `block_size` keys (and at least 2) are buffered at once: while
+    there are more runs than that, or than MERGE_FAN_IN, each group of that
+    many is merged into one longer run in `scratch`, and the group removed.
+    """
+    fan_in = max(2, min(MERGE_FAN_IN, block_size))
+    runs = list(runs)
+    while len(runs) > fan_in:
+        merged = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            if len(group) == 1:
+                merged.extend(group)
+                continue
+            handle, run = tempfile.mkstemp(suffix=".bin", dir=scratch)
+            with os.fdopen(handle, "wb") as f:
+                for block in merge_pass(group, block_size):
+                    block.tofile(f)
+            for old in group:
+                os.remove(old)
+            merged.append(run)
+        runs = merged
+    yield from merge_pass(runs, block_size)
+
+
+def merge_pass(runs, block_size):
+    """
+    Merges sorted run files in one pass, yielding sorted blocks of distinct
+    keys, with max(block_size // len(runs), 1) keys buffered from each run.
+    """
+    arrays = [np.memmap(run, dtype=np.int64, mode="r") for run in runs]
+    step = max(1, block_size // max(len(arrays), 1))
+    positions = [0] * len(arrays)
+    buffers = [np.empty(0, dtype=np.int64) for _ in arrays]
+    last = None
+
+    while True:
+        for i, array in enumerate(arrays):
+            if not len(buffers[i]) and positions[i] < len(array):
+                buffers[i] = np.array(array[positions[i]:positions[i] + step])
+                positions[i] += step
+        active = [i for i in range(len(arrays)) if len(buffers[i])]
+        if not active:
+            return
+
+        # Every key up to the smallest buffered maximum is now in a buffer:
+        # keys still on disk in any run are at least that run's buffered maximum
+        limit = min(buffers[i][-1] for i in active)
+        parts = []
+        for i in active:
+            n = np.searchsorted(buffers[i], limit, side="right")
+            parts.append(buffers[i][:n])
+            buffers[i] = buffers[i][n:]
+
+        block = np.unique(np.concatenate(parts))
+        if last is not None:
+            block = block[block > last]
+        if len(block):
+            last = block[-1]
+            yield block
+
+
+def write_csr(path, indptr_name, indices_name, blocks, num_rows, stride, scratch, block_size):
+    """
+    Writes CSR arrays to the snapshot directory `path` from sorted blocks of
+    keys row * stride + column, without holding all of the keys at once.
+    """
+    counts = np.zeros(num_rows, dtype=np.int64)
+    raw = os.path.join(scratch, f"{indices_name}.bin")
+    total = 0
+    with open(raw, "wb") as f:
+        for block in blocks:
+            counts += np.bincount(block // stride, minlength=num_rows)
+            f.write((block % stride).astype(np.int32).tobytes())
+            total += len(block)
+
+    indptr = open_memmap(os.path.join(path, f"{indptr_name}.npy"), mode="w+",
+                         dtype=np.int64, shape=(num_rows + 1,))
+    indptr[0] = 0
+    np.cumsum(counts, out=indptr[1:])
+    indptr.flush()
+
+    indices = open_memmap(os.path.join(path, f"{indices_name}.npy"), mode="w+",
+                          dtype=np.int32, shape=(total,))
+    if total:
+        source = np.memmap(raw, dtype=np.int32, mode="r", shape=(total,))
+        for start in range(0, total, block_size):
+            indices[start:start + block_size] = source[start:start + block_size]
+    indices.flush()
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python ingest.py directory [chunk_size]")
+    directory = sys.argv[1]
+    chunk_size = int(sys.argv[2]) if len(sys.argv) == 3 else CHUNK_SIZE
+
+    print("Ingesting data...")
+    ingest(directory, chunk_size)
+    print("Snapshot written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Landmark distance index for degrees
+
+An optional preprocessing step for long-running degrees services: run a
+full breadth-first search from a few dozen high-degree "landmark" people
+and keep each one's distance to every person. By the triangle inequality,
+for any landmark L
+
+    |d(L, s) - d(L, t)|  <=  d(s, t)  <=  d(L, s) + d(L, t)
+
+so distance-only queries get lower and upper bounds from array lookups,
+exact whenever the bounds meet, and shortest_path can drop any person
+whose depth plus lower bound to the target exceeds the upper bound.
+Once built, degrees.py loads the index and searches with it.
+
+Usage: python landmarks.py directory [count]
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from graph import index_path
+from snapshot import SNAPSHOT_DIRECTORY, load_cached_graph
+
+# Number of landmarks used by default
+LANDMARKS = 32
+
+# Distance stored for people a landmark isn't connected to, and for people
+# at least SATURATED away, whose true distance doesn't fit: such entries
+# still show the two are connected, but give no bound
+UNREACHED = np.iinfo(np.uint16).max
+SATURATED = UNREACHED - 1
+
+LANDMARKS_FILE = "landmarks.npz"
+
+
+class LandmarkIndex():
+
+    def __init__(self, graph, landmarks, distances):
+        self.graph = graph
+
+        # Person indices of the landmarks
+        self.landmarks = landmarks
+
+        # distances[i, person] is the degrees of separation between
+        # landmark i and person, or UNREACHED
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, count=LANDMARKS):
+        """
+        Builds the index for the `count` people with the most co-star links.
+        """
+        landmarks = np.argsort(-co_star_counts(graph), kind="stable")[:count]
+        distances = np.full((len(landmarks), graph.num_people), UNREACHED, dtype=np.uint16)
+        for i, landmark in enumerate(landmarks):
+            distance = graph.distances(landmark)
+            connected = distance >= 0
+            distances[i, connected] = np.minimum(distance[connected], SATURATED)
+        return cls(graph, landmarks, distances)
+
+    def save(self, filename):
+        np.savez(filename, landmarks=self.landmarks, distances=self.distances)
+
+    @classmethod
+    def load(cls, graph, filename):
+        with np.load(filename) as data:
+            return cls(graph, data["landmarks"], data["distances"])
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        two person indices. upper is None if no landmark reaches both, and
+        both are None if a landmark shows they aren't connected.
+        """
+        if source == target:
+            return 0, 0
+
+        s = self.distances[:, source]
+        t = self.distances[:, target]
+        s_reached = s != UNREACHED
+        t_reached = t != UNREACHED
+
+        # A landmark connected to exactly one of them separates them
+        if (s_reached != t_reached).any():
+            return None, None
+
+        both = s_reached & t_reached & (s < SATURATED) & (t < SATURATED)
+        if not both.any():
+            return 1, None
+        s = s[both].astype(np.int32)
+        t = t[both].astype(np.int32)
+        return max(1, int(np.abs(s - t).max())), int((s + t).min())
+
+    def distance(self, source, target):
+        """
+        Returns the degrees of separation between two person IDs,
+        or None if they aren't connected.
+        Answered from the index alone whenever its bounds meet.
+        """
+        source = self.graph.person_index[source]
+        target = self.graph.person_index[target]
+        lower, upper = self.bounds(source, target)
+        if lower is not None and lower == upper:
+            return lower
+        path = self.index_path(source, target)
+        return None if path is None else len(path)
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target (both person IDs).
+
+        If no possible path, returns None.
+        """
+        graph = self.graph
+        path = self.index_path(graph.person_index[source], graph.person_index[target])
+        if path is None:
+            return None
+        return [(graph.movie_ids[movie], graph.person_ids[person]) for movie, person in path]
+
+    def index_path(self, source, target):
+        """
+        Breadth-first search between two person indices, pruned by the
+        landmark bounds. Returns a list of (movie, person) index pairs, or None.
+        """
+        lower, upper = self.bounds(source, target)
+        if lower is None:
+            return None
+
+        def prune(people, depth):
+            if upper is None:
+                return np.ones(len(people), dtype=bool)
+            return depth + self.lower_bounds(people, target) <= upper
+
+        parent_movie, parent_person = self.graph.bfs(source, [target], prune)
+        return index_path(parent_movie, parent_person, source, target)
+
+    def lower_bounds(self, people, target):
+        """
+        Returns lower bounds on the distance from each of an array
+        of person indices to `target`.
+        """
+        t = self.distances[:, target]
+        usable = np.flatnonzero(t < SATURATED)
+        d = self.distances[usable[:, None], people].astype(np.int32)
+        known = d < SATURATED
+        gaps = np.where(known, np.abs(d - t[usable, None].astype(np.int32)), 0)
+        return gaps.max(axis=0) if len(gaps) else np.zeros(len(people), dtype=np.int32)
+
+
+def co_star_counts(graph):
+    """
+    Returns, for each person, the total cast size of the movies they starred in.
+    """
+    movie_sizes = np.diff(graph.movie_indptr)
+    people = np.repeat(np.arange(graph.num_people), np.diff(graph.person_indptr))
+    return np.bincount(people, weights=movie_sizes[graph.person_movies], minlength=graph.num_people)
+
+
+def landmarks_file(directory):
+    """
+    Returns the path the landmark index for a data directory is saved to.
+    It lives in the snapshot directory, so it is dropped with a stale snapshot.
+    """
+    return os.path.join(directory, SNAPSHOT_DIRECTORY, LANDMARKS_FILE)
+
+
+def load_landmarks(directory, graph):
+    """
+    Returns the saved LandmarkIndex for a data directory, or None if there isn't one.
+    """
+    try:
+        return LandmarkIndex.load(graph, landmarks_file(directory))
+    except OSError:
+        return None
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python landmarks.py directory [count]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else LANDMARKS
+
+    print("Loading data...")
+    graph = load_cached_graph(directory)
+    print(f"Building index for {count} landmarks...")
+    index = LandmarkIndex.build(graph, count)
+    index.save(landmarks_file(directory))
+    print(f"Saved {landmarks_file(directory)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Name lookup index for degrees
+
+Built at load time from the `names` dict (lower-cased name -> set of
+person IDs). Supports two kinds of query for names that aren't an exact match:
+
+    prefix  - names starting with a query, by binary search over the sorted names
+    fuzzy   - names close to a query, for typos: candidates sharing the most
+              character trigrams with the query, ranked by edit distance
+
+Each trigram's posting list is ordered by name length, so a fuzzy query
+only reads the slice of names whose length is within its edit distance of
+the query's. The rarest trigrams are read first and common ones skipped
+once POSTINGS_BUDGET entries are gathered, so a lookup stays well under a
+millisecond however many names share a trigram like "  j".
+
+Building the postings is most of the cost of the index, so they are built
+with NumPy on the first fuzzy query rather than when the index is: most
+sessions only ever look up names that exist.
+"""
+
+import math
+from bisect import bisect_left, insort
+from functools import cached_property
+
+import jellyfish
+import numpy as np
+
+# Number of trigram candidates re-ranked by edit distance in a fuzzy query
+CANDIDATES = 40
+
+# Most posting entries read by one fuzzy query
+POSTINGS_BUDGET = 4096
+
+# Edits allowed for in a fuzzy query without a max_distance
+DEFAULT_DISTANCE = 3
+
+
+class NameIndex():
+
+    def __init__(self, names):
+
+        # Distinct lower-cased names, sorted for prefix search
+        self.names = sorted(names)
+        self.person_ids = [names[name] for name in self.names]
+        self.lengths = np.array([len(name) for name in self.names], dtype=np.int32)
+
+    @cached_property
+    def postings(self):
+        """
+        Trigram -> (indices into self.names, shortest names first, and the
+        parallel array of their lengths), for every trigram of every name.
+        """
+        # Number the characters the names use, and the names shortest first
+        text = "".join(f"  {name} " for name in self.names)
+        alphabet = sorted(set(text))
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        codes = np.searchsorted(np.array([ord(c) for c in alphabet], dtype=np.uint32), codes)
+        by_length = np.argsort(self.lengths, kind="stable")
+        rank = np.empty(len(self.names), dtype=np.int64)
+        rank[by_length] = np.arange(len(self.names))
+
+        # Every trigram of every name, with the name's rank in its low bits,
+        # so one sort of plain integers groups them by trigram, shortest names
+        # first; only an alphabet too large to pack has its trigrams renumbered
+        owner = np.repeat(np.arange(len(self.names)), self.lengths + 1)
+        position = np.arange(len(owner)) + 2 * owner
+        width = max(len(alphabet) - 1, 1).bit_length()
+        trigram = ((codes[position].astype(np.int64) << 2 * width)
+                   | (codes[position + 1].astype(np.int64) << width) | codes[position + 2])
+        shift = max(len(self.names), 1).bit_length()
+        kinds = None
+        if 3 * width + shift > 63:
+            kinds, trigram = np.unique(trigram, return_inverse=True)
+        keys = np.sort((trigram << shift) | rank[owner])
+        keys = keys[np.diff(keys, prepend=-1) != 0]
+
+        trigram, owner = keys >> shift, by_length[keys & ((1 << shift) - 1)].astype(np.int32)
+        lengths = self.lengths[owner]
+        starts = np.flatnonzero(np.diff(trigram, prepend=-1))
+        ends = np.append(starts[1:], len(keys))
+        firsts = trigram[starts] if kinds is None else kinds[trigram[starts]]
+
+        mask = (1 << width) - 1
+        return {
+            alphabet[code >> 2 * width] + alphabet[code >> width & mask] + alphabet[code & mask]:
+                (owner[start:end], lengths[start:end])
+            for code, start, end in zip(firsts.tolist(), starts.tolist(), ends.tolist())
+        }
+
+    def prefix(self, query, k=10):
+        """
+        Returns up to `k` (name, person IDs) pairs, in name order,
+        for names starting with `query`.
+        """
+        query = query.lower()
+        matches = []
+        i = bisect_left(self.names, query)
+        while i < len(self.names) and len(matches) < k and self.names[i].startswith(query):
+            matches.append((self.names[i], self.person_ids[i]))
+            i += 1
+        return matches
+
+    def fuzzy(self, query, k=10, max_distance=None):
+        """
+        Returns up to `k` (name, person IDs) pairs for the names
+        closest to `query`, nearest first, optionally only those
+        within `max_distance` edits. Only names whose length is within
+        max_distance (or DEFAULT_DISTANCE) of the query's are considered.
+        """
+        query = query.lower()
+        distance = DEFAULT_DISTANCE if max_distance is None else max_distance
+        # Searched for as int32, like the lengths, which are otherwise
+        # copied to int64 on every search
+        reach = np.array([len(query) - distance, len(query) + distance + 1, len(query)],
+                         dtype=np.int32)
+
+        # Each query trigram's names of a length within reach, rarest first
+        lists = []
+        for trigram in set(trigrams(query)):
+            if trigram in self.postings:
+                indices, lengths = self.postings[trigram]
+                start, end = lengths.searchsorted(reach[:2])
+                if end > start:
+                    lists.append((indices, lengths, start, end))
+        if not lists:
+            return []
+        lists.sort(key=lambda postings: postings[3] - postings[2])
+
+        # An edit changes at most 3 trigrams (a transposition 4), so a name
+        # within `distance` edits shares one of the rarest 4 * distance + 1;
+        # past the budget the commoner of those are skipped, and if even the
+        # rarest is too common, only the names nearest the query's length are read
+        indices, lengths, start, end = lists[0]
+        if end - start > POSTINGS_BUDGET:
+            middle = lengths.searchsorted(reach[2])
+            start = min(max(middle - POSTINGS_BUDGET // 2, start), end - POSTINGS_BUDGET)
+            end = start + POSTINGS_BUDGET
+        used = [indices[start:end]]
+        total = end - start
+        for indices, _, start, end in lists[1:4 * distance + 1]:
+            total += end - start
+            if total > POSTINGS_BUDGET:
+                break
+            used.append(indices[start:end])
+
+        # Candidates sharing the most trigrams with the query
+        candidates, shared = np.unique(np.concatenate(used), return_counts=True)
+        if len(candidates) > CANDIDATES:
+            best = np.argpartition(-shared, CANDIDATES)[:CANDIDATES]
+            candidates, shared = candidates[best], shared[best]
+
+        # A name missing m of the used trigrams is at least ceil(m / 4) edits
+        # away, and at least as many as its length differs by: visit names
+        # by that bound, and stop once it can't beat the k-th best found
+        bounds = np.maximum((len(used) - shared + 3) // 4,
+                            np.abs(self.lengths[candidates] - len(query)))
+        order = np.argsort(bounds, kind="stable")
+        limit = math.inf if max_distance is None else max_distance
+        ranked = []
+        for i, bound in zip(candidates[order].tolist(), bounds[order].tolist()):
+            if bound > limit or (len(ranked) >= k and bound > ranked[k - 1][0]):
+                break
+            edits = jellyfish.damerau_levenshtein_distance(query, self.names[i])
+            if edits <= limit:
+                insort(ranked, (edits, self.names[i], i))
+        return [(name, self.person_ids[i]) for _, name, i in ranked[:k]]
+
+
+def trigrams(name):
+    """
+    Returns the character trigrams of a name, padded so that
+    the start and end of the name count for more.
+    """
+    padded = f"  {name} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
@@ -0,0 +1,163 @@
+"""
+Binary snapshot cache for the degrees star graph
+
+After the first load of a data directory, the StarGraph is written to
+`<directory>/.snapshot/` as one .npy file per array plus a string table
+per text column (a UTF-8 blob and an offsets array). Later loads map
+those files with `np.load(mmap_mode="r")` instead of re-parsing the CSV
+files. The people are also stored sorted by name, so a name can be found
+by binary search over the mapped tables without building any dicts. The
+snapshot records the size and mtime of each CSV file and is ignored (and
+rewritten) as soon as any of them changes.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from graph import StarGraph, load_graph
+
+SNAPSHOT_DIRECTORY = ".snapshot"
+SNAPSHOT_VERSION = 2
+
+CSV_FILES = ["people.csv", "movies.csv", "stars.csv"]
+
+ARRAYS = ["person_indptr", "person_movies", "movie_indptr", "movie_people", "person_name_order"]
+STRINGS = ["person_ids", "person_names", "person_births",
+           "movie_ids", "movie_titles", "movie_years"]
+
+
+class StringTable():
+    """
+    Read-only sequence of strings stored as one UTF-8 blob, where string i
+    is the bytes blob[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(blob, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError("string table index out of range")
+        i %= len(self)
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        data = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode("utf-8")
+
+
+def csv_stats(directory):
+    """
+    Returns the size and modification time of each CSV file,
+    used to tell whether a snapshot is still current.
+    """
+    stats = {}
+    for filename in CSV_FILES:
+        stat = os.stat(os.path.join(directory, filename))
+        stats[filename] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return stats
+
+
+def write_snapshot(graph, directory):
+    """
+    Writes `graph`, loaded from the CSV files in `directory`, to a snapshot.
+    The manifest is written last, so a partial snapshot is never read.
+    """
+    path = clear_snapshot(directory)
+    for name in ARRAYS:
+        np.save(os.path.join(path, f"{name}.npy"), getattr(graph, name))
+    for name in STRINGS:
+        write_strings(path, name, getattr(graph, name))
+    write_manifest(path, directory)
+
+
+def clear_snapshot(directory):
+    """
+    Removes any snapshot for `directory`, returning an empty snapshot directory.
+    """
+    path = os.path.join(directory, SNAPSHOT_DIRECTORY)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+    return path
+
+
+def write_strings(path, name, strings):
+    """
+    Writes a column of strings to the snapshot directory `path` as a string table.
+    """
+    table = StringTable.from_strings(strings)
+    np.save(os.path.join(path, f"{name}.blob.npy"), table.blob)
+    np.save(os.path.join(path, f"{name}.offsets.npy"), table.offsets)
+
+
+def write_manifest(path, directory):
+    """
+    Marks the snapshot in `path` complete, and current for the CSV files in `directory`.
+    """
+    manifest = {"version": SNAPSHOT_VERSION, "csv": csv_stats(directory)}
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+
+def read_snapshot(directory):
+    """
+    Maps the snapshot for `directory` into a StarGraph.
+
+    Returns None if there is no snapshot, or it is out of date.
+    """
+    path = os.path.join(directory, SNAPSHOT_DIRECTORY)
+    try:
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("csv") != csv_stats(directory):
+        return None
+
+    def mapped(filename):
+        try:
+            return np.load(os.path.join(path, filename), mmap_mode="r")
+        except ValueError:
+            # Some NumPy versions can't map zero-length arrays
+            return np.load(os.path.join(path, filename))
+
+    fields = {name: mapped(f"{name}.npy") for name in ARRAYS}
+    for name in STRINGS:
+        fields[name] = StringTable(mapped(f"{name}.blob.npy"), mapped(f"{name}.offsets.npy"))
+    return StarGraph(**fields)
+
+
+def load_cached_graph(directory):
+    """
+    Loads the StarGraph for `directory` from its snapshot if current,
+    otherwise from the CSV files, writing a new snapshot for next time.
+    """
+    graph = read_snapshot(directory)
+    if graph is not None:
+        return graph
+
+    graph = load_graph(directory)
+    try:
+        write_snapshot(graph, directory)
+    except OSError:
+        # Read-only data directory: carry on without a cache
+        pass
+    return graph
@@ -0,0 +1,427 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from degrees import *
+from batch import resolve, run_queries
+from graph import load_graph
+from ingest import ingest
+from landmarks import LandmarkIndex
+from nameindex import NameIndex
+from snapshot import SNAPSHOT_DIRECTORY, load_cached_graph, read_snapshot
+from util import *
+
+DIRECTORY = os.path.join(os.path.dirname(__file__), "small")
+
+KEVIN_BACON = "102"
+TOM_HANKS = "158"
+EMMA_WATSON = "914612"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def small_data():
+    load_data(DIRECTORY)
+
+
+def test_hashed_queue_frontier():
+    """
+    GIVEN   a HashedQueueFrontier holding three nodes
+    WHEN    nodes are removed
+    THEN    they come out first-in first-out, and contains_state tracks what is still held
+    """
+    frontier = HashedQueueFrontier()
+    for state in ["a", "b", "c"]:
+        frontier.add(Node(state=state, parent=None, action=None))
+
+    assert frontier.contains_state("a")
+    assert frontier.remove().state == "a"
+    assert not frontier.contains_state("a")
+    assert [frontier.remove().state, frontier.remove().state] == ["b", "c"]
+    assert frontier.empty()
+    with pytest.raises(Exception):
+        frontier.remove()
+
+
+def test_hashed_stack_frontier():
+    frontier = HashedStackFrontier()
+    for state in ["a", "b", "a"]:
+        frontier.add(Node(state=state, parent=None, action=None))
+
+    assert frontier.remove().state == "a"
+    # A state added twice stays in the frontier until both nodes are removed
+    assert frontier.contains_state("a")
+    assert frontier.remove().state == "b"
+    assert frontier.remove().state == "a"
+    assert not frontier.contains_state("a")
+
+
+def test_shortest_path():
+    path = shortest_path(KEVIN_BACON, TOM_HANKS)
+
+    assert len(path) == 1
+    movie_id, person_id = path[0]
+    assert person_id == TOM_HANKS
+    assert movie_id in people[KEVIN_BACON]["movies"]
+
+
+def test_bidirectional_shortest_path():
+    """
+    GIVEN   every pair of people in the small dataset
+    WHEN    bidirectional_shortest_path() is called
+    THEN    it finds a connected path of the same length as breadth-first search
+    """
+    for source in people:
+        for target in people:
+            path = bidirectional_shortest_path(source, target)
+            if source == target:
+                assert path == []
+                continue
+            try:
+                expected = shortest_path(source, target)
+            except Exception:
+                expected = None
+
+            if expected is None:
+                assert path is None
+                continue
+            assert len(path) == len(expected)
+
+            person_id = source
+            for movie_id, next_id in path:
+                assert movie_id in people[person_id]["movies"]
+                assert movie_id in people[next_id]["movies"]
+                person_id = next_id
+            assert person_id == target
+
+
+def test_star_graph_shortest_path():
+    """
+    GIVEN   the small dataset loaded as a CSR StarGraph
+    WHEN    StarGraph.shortest_path() and bidirectional_path() are called for every pair of people
+    THEN    they agree in length with breadth-first search over the dict-based data
+    """
+    graph = load_graph(DIRECTORY)
+    assert graph.num_people == len(people)
+    assert graph.num_movies == len(movies)
+
+    for source in people:
+        for target in people:
+            path = graph.shortest_path(source, target)
+            expected = bidirectional_shortest_path(source, target)
+            meeting = graph.bidirectional_path(graph.person_index[source], graph.person_index[target])
+            if expected is None:
+                assert path is None and meeting is None
+                continue
+            assert len(path) == len(expected) == len(meeting)
+            assert path == [] or path[-1][1] == target
+
+            # Each step of the bidirectional path is a movie both people starred in
+            person = graph.person_index[source]
+            for movie, next_person in meeting:
+                assert movie in graph.movies_for_person(person)
+                assert movie in graph.movies_for_person(next_person)
+                person = next_person
+            assert person == graph.person_index[target]
+
+
+def test_snapshot(tmp_path):
+    """
+    GIVEN   a copy of the small dataset
+    WHEN    it is loaded twice through load_cached_graph()
+    THEN    the second load maps the snapshot written by the first, with the same graph,
+            and the snapshot is ignored once a CSV file changes
+    """
+    directory = tmp_path / "small"
+    shutil.copytree(DIRECTORY, directory, ignore=shutil.ignore_patterns(SNAPSHOT_DIRECTORY))
+
+    assert read_snapshot(directory) is None
+    loaded = load_cached_graph(directory)
+    mapped = read_snapshot(directory)
+
+    assert mapped is not None
+    assert list(mapped.person_ids) == list(loaded.person_ids)
+    assert list(mapped.movie_titles) == list(loaded.movie_titles)
+    assert (mapped.person_movies == loaded.person_movies).all()
+    assert mapped.shortest_path(KEVIN_BACON, TOM_HANKS) == loaded.shortest_path(KEVIN_BACON, TOM_HANKS)
+
+    with open(directory / "stars.csv", "a") as f:
+        f.write(f"{EMMA_WATSON},104257\n")
+    assert read_snapshot(directory) is None
+    assert load_cached_graph(directory).shortest_path(KEVIN_BACON, EMMA_WATSON) is not None
+
+
+def test_mapped_name_lookup(tmp_path, monkeypatch):
+    """
+    GIVEN   the snapshot of the small dataset, mapped without building any dicts
+    WHEN    people are looked up by name and connected, as main() does
+    THEN    names resolve by binary search, ambiguous names ask for an ID,
+            and the path matches bidirectional search
+    """
+    directory = tmp_path / "small"
+    shutil.copytree(DIRECTORY, directory, ignore=shutil.ignore_patterns(SNAPSHOT_DIRECTORY))
+    with open(directory / "people.csv", "a") as f:
+        f.write("999,Emma Watson,2000\n")
+    load_cached_graph(directory)
+    graph = read_snapshot(directory)
+
+    source = person_for_name(graph, "kevin bacon")
+    target = person_for_name(graph, "Tom Hanks")
+    assert graph.person_ids[source] == KEVIN_BACON
+    path = graph.bidirectional_path(source, target)
+    assert len(path) == len(bidirectional_shortest_path(KEVIN_BACON, TOM_HANKS))
+    assert "person_index" not in vars(graph) and "names" not in vars(graph)
+
+    monkeypatch.setattr("builtins.input", lambda prompt: "999")
+    assert graph.person_ids[person_for_name(graph, "Emma Watson")] == "999"
+
+    for name, person_ids in graph.names.items():
+        assert sorted(graph.person_ids[person] for person in graph.people_named(name)) == sorted(person_ids)
+    assert graph.people_named("NOBODY") == []
+
+
+def test_batch_queries():
+    """
+    GIVEN   a batch of queries by name and by ID, including unknown and unconnected people
+    WHEN    run_queries() answers them in one process and across a process pool
+    THEN    both give one result per query, matching bidirectional search
+    """
+    graph = load_graph(DIRECTORY)
+    queries = [("Kevin Bacon", "Sally Field"), ("Kevin Bacon", "Tom Cruise"),
+               ("Tom Cruise", "Emma Watson"), (TOM_HANKS, "Dustin Hoffman"), ("Nobody", "Tom Hanks")]
+
+    serial = sorted(run_queries(graph, queries, processes=1), key=lambda record: record["index"])
+    pooled = sorted(run_queries(graph, queries, processes=2), key=lambda record: record["index"])
+
+    assert serial == pooled
+    assert [record["index"] for record in serial] == list(range(len(queries)))
+    assert "error" in serial[4]
+    assert serial[2]["degrees"] is None
+    for record in serial[:2] + serial[3:4]:
+        source = resolve(graph, record["source"])
+        target = resolve(graph, record["target"])
+        expected = bidirectional_shortest_path(graph.person_ids[source], graph.person_ids[target])
+        assert record["degrees"] == len(expected)
+
+
+def test_batch_unknown_target(monkeypatch):
+    """
+    GIVEN   a batch whose only query has a known source and an unknown target
+    WHEN    run_queries() answers it
+    THEN    it reports the error without searching from the source
+    """
+    import batch
+    graph = load_graph(DIRECTORY)
+    searched = []
+    monkeypatch.setattr(batch, "search", lambda task: searched.append(task) or [])
+
+    records = list(run_queries(graph, [("Kevin Bacon", "Nobody")], processes=1))
+    assert len(records) == 1 and "error" in records[0]
+    assert searched == []
+
+
+def test_landmark_index(tmp_path):
+    """
+    GIVEN   a landmark index over the small dataset
+    WHEN    bounds(), distance() and shortest_path() are called for every pair of people
+    THEN    the bounds contain the true distance, and the pruned search stays shortest
+    """
+    graph = load_graph(DIRECTORY)
+    index = LandmarkIndex.build(graph, count=3)
+    index.save(tmp_path / "landmarks.npz")
+    index = LandmarkIndex.load(graph, tmp_path / "landmarks.npz")
+
+    for source in people:
+        for target in people:
+            expected = bidirectional_shortest_path(source, target)
+            lower, upper = index.bounds(graph.person_index[source], graph.person_index[target])
+            if expected is None:
+                assert index.distance(source, target) is None
+                assert index.shortest_path(source, target) is None
+                continue
+            assert lower <= len(expected)
+            assert upper is None or len(expected) <= upper
+            assert index.distance(source, target) == len(expected)
+            assert len(index.shortest_path(source, target)) == len(expected)
+
+
+def test_landmark_long_paths():
+    """
+    GIVEN   a chain of 400 people, each starring with the next, and a landmark at one end
+    WHEN    bounds are taken for pairs over 255 apart, and with saturated distances
+    THEN    the bounds hold, and saturated entries give no bound rather than a wrong one
+    """
+    from graph import graph_from_edges
+    from landmarks import SATURATED
+
+    n = 400
+    people = np.repeat(np.arange(n), 2)[1:-1].astype(np.int32)
+    films = np.repeat(np.arange(n - 1), 2).astype(np.int32)
+    graph = graph_from_edges([str(i) for i in range(n)], [f"P{i}" for i in range(n)], [""] * n,
+                             [str(i) for i in range(n - 1)], [""] * (n - 1), [""] * (n - 1),
+                             people, films)
+    assert LandmarkIndex.build(graph, count=1).distances.max() > 255
+    index = LandmarkIndex(graph, np.array([0]), graph.distances(0)[None].astype(np.uint16))
+
+    assert index.bounds(10, 390) == (380, 400)
+    assert index.distance("0", "399") == 399
+    assert len(index.shortest_path("5", "305")) == 300
+
+    index.distances[0, 300:] = SATURATED
+    assert index.bounds(10, 390) == (1, None)
+    assert index.bounds(290, 310)[1] is None
+    assert len(index.shortest_path("290", "310")) == 20
+
+
+def test_main_uses_landmarks(tmp_path, monkeypatch, capsys):
+    """
+    GIVEN   a copy of the small dataset with a landmark index built for it
+    WHEN    main() connects two people
+    THEN    it searches with the landmark index, and prints the shortest path
+    """
+    import degrees
+    import landmarks
+
+    directory = tmp_path / "small"
+    shutil.copytree(DIRECTORY, directory, ignore=shutil.ignore_patterns(SNAPSHOT_DIRECTORY))
+    graph = load_cached_graph(directory)
+    LandmarkIndex.build(graph, count=2).save(landmarks.landmarks_file(directory))
+
+    searched = []
+    index_path = LandmarkIndex.index_path
+    monkeypatch.setattr(LandmarkIndex, "index_path",
+                        lambda self, source, target: searched.append(target) or index_path(self, source, target))
+    answers = iter(["Kevin Bacon", "Tom Hanks"])
+    monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+    monkeypatch.setattr("sys.argv", ["degrees.py", str(directory)])
+    degrees.main()
+
+    assert len(searched) == 1
+    expected = len(bidirectional_shortest_path(KEVIN_BACON, TOM_HANKS))
+    assert f"{expected} degrees of separation." in capsys.readouterr().out
+
+
+def test_name_index():
+    """
+    GIVEN   the name index built by load_data()
+    WHEN    prefix and fuzzy queries are made
+    THEN    prefix matches come back in name order, misspelt names find the right person,
+            and the trigram postings are only built by the first fuzzy query
+    """
+    index = NameIndex(names)
+
+    assert [name for name, _ in index.prefix("Tom")] == ["tom cruise", "tom hanks"]
+    assert index.prefix("tom h") == [("tom hanks", {TOM_HANKS})]
+    assert index.prefix("zz") == []
+    assert "postings" not in vars(index)
+
+    assert index.fuzzy("Kevin Bakon", k=1) == [("kevin bacon", {KEVIN_BACON})]
+    assert index.fuzzy("tom hnaks", k=1) == [("tom hanks", {TOM_HANKS})]
+    assert index.fuzzy("xxxxxxxx qqqq", max_distance=2) == []
+
+
+def test_name_index_latency():
+    """
+    GIVEN   a name index over 100,000 made-up names sharing a few common trigrams
+    WHEN    names with one typo are looked up as main() does
+    THEN    most find the intended name, and the median lookup takes under a millisecond
+    """
+    import random
+    import time
+
+    rng = random.Random(0)
+    syllables = ["an", "be", "car", "dan", "el", "fi", "go", "har", "is", "jo", "ka", "li", "mo",
+                 "ne", "or", "pe", "qui", "ro", "sa", "te", "un", "vi", "wa", "son", "ton", "ley"]
+
+    def word():
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3)))
+
+    index = NameIndex({f"{word()} {word()}": {str(i)} for i in range(100_000)})
+    found, times = 0, []
+    for _ in range(200):
+        name = rng.choice(index.names)
+        i = rng.randrange(len(name))
+        query = name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1:]
+
+        # Best of three, so a lookup the scheduler preempted doesn't count
+        elapsed = []
+        for _ in range(3):
+            start = time.perf_counter()
+            matches = index.fuzzy(query, k=5, max_distance=3)
+            elapsed.append(time.perf_counter() - start)
+        times.append(min(elapsed))
+        found += any(match == name for match, _ in matches)
+
+    assert found >= 190
+    assert sorted(times)[len(times) // 2] < 0.001
+
+
+def test_ingest(tmp_path):
+    """
+    GIVEN   a copy of the small dataset with an orphan star row and a duplicate star row
+    WHEN    ingest() streams it in chunks of 4 rows
+    THEN    the snapshot it writes maps to the same graph as load_graph()
+    """
+    directory = tmp_path / "small"
+    shutil.copytree(DIRECTORY, directory, ignore=shutil.ignore_patterns(SNAPSHOT_DIRECTORY))
+    with open(directory / "stars.csv", "a") as f:
+        f.write("999999999,104257\n")
+        f.write(f"{KEVIN_BACON},112384\n")
+
+    ingest(directory, chunk_size=4)
+    streamed = read_snapshot(directory)
+    loaded = load_graph(directory)
+
+    assert streamed is not None
+    for name in ["person_indptr", "person_movies", "movie_indptr", "movie_people"]:
+        assert (getattr(streamed, name) == getattr(loaded, name)).all()
+    assert list(streamed.person_names) == list(loaded.person_names)
+
+
+def test_merge_runs(tmp_path, monkeypatch):
+    """
+    GIVEN   more sorted, overlapping runs than keys allowed in a block, or than MERGE_FAN_IN
+    WHEN    merge_runs() merges them
+    THEN    the blocks hold every distinct key once, in order, none over the block size
+    """
+    import ingest
+
+    rng = np.random.default_rng(0)
+    keys = [np.unique(rng.integers(0, 500, rng.integers(1, 40))) for _ in range(23)]
+    expected = np.unique(np.concatenate(keys)).tolist()
+
+    for block_size, fan_in in [(4, 64), (1000, 5)]:
+        monkeypatch.setattr(ingest, "MERGE_FAN_IN", fan_in)
+        runs = []
+        for i, run in enumerate(keys):
+            runs.append(str(tmp_path / f"run{i}.bin"))
+            run.tofile(runs[-1])
+        blocks = list(ingest.merge_runs(runs, block_size, tmp_path))
+        assert all(len(block) <= block_size for block in blocks)
+        assert np.concatenate(blocks).tolist() == expected
+
+
+def test_search_strategies():
+    """
+    GIVEN   every pair of people in the small dataset
+    WHEN    search_path() runs each search module strategy
+    THEN    bfs, ucs, astar and ida_star find shortest paths, and dfs finds some path
+    """
+    for source in people:
+        for target in people:
+            expected = bidirectional_shortest_path(source, target)
+            for strategy in search.STRATEGIES:
+                path, result = search_path(source, target, strategy)
+                if expected is None:
+                    assert path is None
+                    continue
+                assert result.nodes_expanded >= 0 and result.wall_time >= 0
+                if strategy == "dfs":
+                    assert len(path) >= len(expected)
+                else:
+                    assert len(path) == len(expected)
+                assert path == [] or path[-1][1] == target
+
+    with pytest.raises(ValueError):
+        search_path(KEVIN_BACON, TOM_HANKS, "greedy")
@@ -1,3 +1,6 @@
+from collections import deque
+
+
 class Node:
     def __init__(self, state, parent, action):
         self.state = state
@@ -18,6 +21,9 @@ class Frontier:
     def empty(self):
         return len(self.frontier) == 0
 
+    def __len__(self):
+        return len(self.frontier)
+
 
 class StackFrontier(Frontier):
     def remove(self):
@@ -37,3 +43,54 @@ class QueueFrontier(Frontier):
             node = self.frontier[0]
             self.frontier = self.frontier[1:]
             return node
+
+
+class HashedFrontier(Frontier):
+    """
+    Frontier that keeps a count of the states it holds alongside its nodes,
+    so contains_state is a hash lookup rather than a scan of the frontier.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def discard_state(self, state):
+        count = self.states[state] - 1
+        if count:
+            self.states[state] = count
+        else:
+            del self.states[state]
+
+
+class HashedStackFrontier(HashedFrontier):
+    """Last-in first-out with O(1) remove and contains_state: depth-first search"""
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        node = self.frontier.pop()
+        self.discard_state(node.state)
+        return node
+
+
+class HashedQueueFrontier(HashedFrontier):
+    """First-in first-out with O(1) remove and contains_state: breadth-first search"""
+
+    def __init__(self):
+        super().__init__()
+        self.frontier = deque()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        node = self.frontier.popleft()
+        self.discard_state(node.state)
+        return node
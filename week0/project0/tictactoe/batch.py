@@ -0,0 +1,126 @@
+"""
+Batch position evaluation
+
+Values a whole list of boards at once, returning each board's minimax value
+(1 if X wins with perfect play, -1 if O does, 0 for a draw) and the best
+move for the player to move, in input order.
+
+    python batch.py boards.txt
+        each line of boards.txt is a board of 9 characters, row by row:
+        X, O, or . for an empty cell
+
+Boards are first reduced to their canonical form under the 8 board
+symmetries, so each distinct position is solved once however many times,
+and in whichever orientation, it appears. The positions are spread over a
+process pool; positions with many empty cells are split at the root into
+one task per move, so a few expensive positions don't leave workers idle.
+"""
+
+import json
+import sys
+from multiprocessing import Pool
+
+import bitboard
+import book
+
+# Split positions with at least this many empty cells into a task per root move
+SPLIT_EMPTY = 7
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python batch.py boards.txt")
+
+    with open(sys.argv[1]) as f:
+        boards = [parse(line.strip()) for line in f if line.strip()]
+
+    for index, (value, move) in enumerate(evaluate(boards)):
+        print(json.dumps({"index": index, "value": value, "move": move}))
+
+
+def parse(text):
+    """Returns the board for a row-by-row string of X, O and . characters."""
+    if len(text) != 9 or set(text) - {"X", "O", "."}:
+        raise Exception(f"invalid board {text}")
+    cells = [cell if cell != "." else bitboard.EMPTY for cell in text]
+    return [cells[0:3], cells[3:6], cells[6:9]]
+
+
+def evaluate(boards, processes=None):
+    """
+    Returns a list of (value, move) for each board, in input order: the
+    value for X with perfect play, and the optimal action (i, j) for the
+    player to move, or None if the game is over.
+    """
+    # Canonical position -> (player, opponent) in canonical orientation,
+    # and each board's canonical key and symmetry
+    positions = {}
+    keys = []
+    for board in boards:
+        x, o = bitboard.encode(board)
+        player, opponent = (x, o) if bitboard.to_move(x, o) == bitboard.X else (o, x)
+        key, s = bitboard.canonical_symmetry(player, opponent)
+        keys.append((key, s))
+        if key not in positions:
+            table = bitboard.SYMMETRY_TABLES[s]
+            positions[key] = (table[player], table[opponent])
+
+    solved = solve_positions(positions, processes)
+
+    results = []
+    for board, (key, s) in zip(boards, keys):
+        value, cell = solved[key]
+        if bitboard.to_move(*bitboard.encode(board)) == bitboard.O:
+            value = -value
+        move = None if cell is None else divmod(bitboard.SYMMETRIES[s].index(cell), 3)
+        results.append((value, move))
+    return results
+
+
+def solve_positions(positions, processes=None):
+    """
+    Solves a dict of canonical key -> (player, opponent), returning
+    key -> (value for the player to move, best move cell or None).
+    """
+    tasks = []
+    for key, (player, opponent) in positions.items():
+        free = [cell for cell in range(9) if not (player | opponent) & 1 << cell]
+        if len(free) >= SPLIT_EMPTY and not is_over(player, opponent):
+            tasks.extend((key, player, opponent, cell) for cell in free)
+        else:
+            tasks.append((key, player, opponent, None))
+
+    if len(tasks) <= 1 or processes == 1:
+        answers = map(solve, tasks)
+    else:
+        with Pool(processes) as pool:
+            answers = pool.map(solve, tasks, chunksize=max(len(tasks) // (4 * (processes or 8)), 1))
+
+    # Combine root-split moves: the best is the first cell with the highest value
+    solved = {}
+    for (key, _, _, _), (value, cell) in zip(tasks, answers):
+        if key not in solved or value > solved[key][0]:
+            solved[key] = (value, cell)
+    return solved
+
+
+def solve(task):
+    """
+    Solves one task: a whole position if `cell` is None, returning
+    (value, best cell), or else the single root move `cell`,
+    returning (value of playing it, cell).
+    """
+    _, player, opponent, cell = task
+    if cell is not None:
+        return -bitboard.negamax(opponent, player | 1 << cell), cell
+    if is_over(player, opponent):
+        return bitboard.negamax(player, opponent), None
+    return bitboard.negamax(player, opponent), book.best_cell(player, opponent)
+
+
+def is_over(player, opponent):
+    return bitboard.won(player) or bitboard.won(opponent) or player | opponent == bitboard.FULL
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Bitboard minimax engine for Tic Tac Toe
+
+A board is encoded as two 9-bit masks, one per player, where cell (i, j)
+is bit 3 * i + j. Wins are checked against the 8 precomputed line masks,
+moves are single bit operations (no copying of boards), and the value of
+every position searched is kept in a transposition table keyed by its
+canonical form: the smallest encoding among its 8 rotations and
+reflections, so symmetric positions are only ever searched once.
+"""
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+LINES = [
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100                # diagonals
+]
+
+
+def symmetries():
+    """
+    Returns the 8 symmetries of the board as permutations:
+    cell index -> cell index it maps to.
+    """
+    def rotate(i):
+        row, col = divmod(i, 3)
+        return 3 * col + (2 - row)
+
+    def reflect(i):
+        row, col = divmod(i, 3)
+        return 3 * row + (2 - col)
+
+    permutations = []
+    permutation = list(range(9))
+    for _ in range(4):
+        permutations.append(permutation)
+        permutations.append([reflect(i) for i in permutation])
+        permutation = [rotate(i) for i in permutation]
+    return permutations
+
+
+SYMMETRIES = symmetries()
+
+# SYMMETRY_TABLES[s][mask] is `mask` transformed by symmetry s
+SYMMETRY_TABLES = [
+    [sum(1 << permutation[i] for i in range(9) if mask >> i & 1) for mask in range(1 << 9)]
+    for permutation in SYMMETRIES
+]
+
+# Canonical position -> value for the player to move: 1 win, 0 draw, -1 loss
+table = {}
+
+
+def encode(board):
+    """
+    Returns (x, o) bit masks for a 3x3 board of X, O and EMPTY.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def won(mask):
+    return any(mask & line == line for line in LINES)
+
+
+def canonical(player, opponent):
+    """
+    Returns the transposition table key for a position:
+    the smallest of its 8 symmetric encodings.
+    """
+    return min(symmetry[player] << 9 | symmetry[opponent] for symmetry in SYMMETRY_TABLES)
+
+
+def canonical_symmetry(player, opponent):
+    """
+    Returns (key, s): the canonical key of a position,
+    and the index of the symmetry that maps the position to it.
+    """
+    return min((symmetry[player] << 9 | symmetry[opponent], s)
+               for s, symmetry in enumerate(SYMMETRY_TABLES))
+
+
+def negamax(player, opponent):
+    """
+    Returns the value of a position for the player to move (whose
+    pieces are `player`), with perfect play from both sides.
+    """
+    if won(opponent):
+        return -1
+    if player | opponent == FULL:
+        return 0
+
+    key = canonical(player, opponent)
+    if key in table:
+        return table[key]
+
+    value = -1
+    free = FULL & ~(player | opponent)
+    while free:
+        move = free & -free
+        free ^= move
+        value = max(value, -negamax(opponent, player | move))
+        if value == 1:
+            break
+
+    table[key] = value
+    return value
+
+
+def to_move(x, o):
+    """Returns the player to move, given (x, o) masks."""
+    return X if bin(x).count("1") == bin(o).count("1") else O
+
+
+def value(board):
+    """
+    Returns the minimax value of a board: 1 if X wins with perfect play,
+    -1 if O does, 0 for a draw.
+    """
+    x, o = encode(board)
+    if to_move(x, o) == X:
+        return negamax(x, o)
+    return -negamax(o, x)
+
+
+def best_move(board):
+    """
+    Returns the optimal action (i, j) for the player to move on the board,
+    or None if the game is over.
+    """
+    x, o = encode(board)
+    player, opponent = (x, o) if to_move(x, o) == X else (o, x)
+    if won(player) or won(opponent) or player | opponent == FULL:
+        return None
+
+    best = None
+    best_value = -2
+    for cell in range(9):
+        move = 1 << cell
+        if (player | opponent) & move:
+            continue
+        move_value = -negamax(opponent, player | move)
+        if move_value > best_value:
+            best, best_value = divmod(cell, 3), move_value
+            if best_value == 1:
+                break
+    return best
@@ -0,0 +1,174 @@
+"""
+Solved-position book for Tic Tac Toe
+
+Generated on first use: every position reachable from the empty board is
+enumerated once, reduced to its canonical form under the 8 board
+symmetries, and solved with the bitboard engine. Each non-terminal
+canonical position is stored as a single 32-bit entry
+
+    canonical key (18 bits) | value + 1 (2 bits) | best move cell (4 bits)
+
+sorted by key, in BOOK_FILE as little-endian unsigned 32-bit integers,
+so the file reads the same on any machine. The file is a cache, not kept
+in version control: load() generates and writes it if it is missing, which
+takes well under a second. minimax() looks moves up in the book and falls
+back to search for any position it doesn't find.
+
+Usage: python book.py [games]
+    regenerates the book, then optionally benchmarks `games` games of
+    book moves against random moves
+"""
+
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+import bitboard
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+# struct format of one book entry in the file
+ENTRY_FORMAT = "<I"
+
+# Sorted book entries, loaded on first lookup
+entries = None
+
+
+def generate():
+    """
+    Returns the sorted book entries for every reachable non-terminal position.
+    """
+    solved = {}
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        player, opponent = stack.pop()
+        key, s = bitboard.canonical_symmetry(player, opponent)
+        if key in seen:
+            continue
+        seen.add(key)
+        if bitboard.won(opponent) or player | opponent == bitboard.FULL:
+            continue
+
+        # Solve the canonical orientation, so the stored move needs no mapping
+        player = bitboard.SYMMETRY_TABLES[s][player]
+        opponent = bitboard.SYMMETRY_TABLES[s][opponent]
+        value = bitboard.negamax(player, opponent)
+        cell = best_cell(player, opponent)
+        solved[key] = key << 6 | (value + 1) << 4 | cell
+
+        for move in range(9):
+            if not (player | opponent) & 1 << move:
+                stack.append((opponent, player | 1 << move))
+
+    return array("I", sorted(solved.values()))
+
+
+def best_cell(player, opponent):
+    """
+    Returns the cell index of the first move that keeps the value of a position.
+    """
+    best, best_value = None, -2
+    for cell in range(9):
+        if (player | opponent) & 1 << cell:
+            continue
+        move_value = -bitboard.negamax(opponent, player | 1 << cell)
+        if move_value > best_value:
+            best, best_value = cell, move_value
+    return best
+
+
+def write(book, filename=BOOK_FILE):
+    with open(filename, "wb") as f:
+        f.write(b"".join(struct.pack(ENTRY_FORMAT, entry) for entry in book))
+
+
+def load(filename=BOOK_FILE):
+    """
+    Loads the book entries, generating the book and writing it to the
+    book file first if there is none (or only in memory, if the book
+    file can't be written).
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        book = generate()
+        try:
+            write(book, filename)
+        except OSError:
+            pass
+        return book
+    return array("I", [entry for entry, in struct.iter_unpack(ENTRY_FORMAT, data)])
+
+
+def lookup(board):
+    """
+    Returns the book move (i, j) for the player to move on a board,
+    or None if the position isn't in the book.
+    """
+    global entries
+    if entries is None:
+        entries = load()
+
+    x, o = bitboard.encode(board)
+    player, opponent = (x, o) if bitboard.to_move(x, o) == bitboard.X else (o, x)
+    key, s = bitboard.canonical_symmetry(player, opponent)
+
+    i = bisect_left(entries, key << 6)
+    if i == len(entries) or entries[i] >> 6 != key:
+        return None
+
+    # Map the canonical move back through the inverse of symmetry s
+    cell = bitboard.SYMMETRIES[s].index(entries[i] & 0b1111)
+    return divmod(cell, 3)
+
+
+def selfplay(games, seed=0):
+    """
+    Plays `games` games of book moves against uniformly random moves,
+    alternating sides. Returns (book wins, draws, book losses, moves per second).
+    """
+    from tictactoe import actions, initial_state, minimax, player, result, terminal, winner
+
+    rng = random.Random(seed)
+    wins = draws = losses = moves = 0
+    started = time.perf_counter()
+    for game in range(games):
+        book_player = bitboard.X if game % 2 == 0 else bitboard.O
+        board = initial_state()
+        while not terminal(board):
+            if player(board) == book_player:
+                move = minimax(board)
+            else:
+                move = rng.choice(sorted(actions(board)))
+            board = result(board, move)
+            moves += 1
+        if winner(board) is None:
+            draws += 1
+        elif winner(board) == book_player:
+            wins += 1
+        else:
+            losses += 1
+    return wins, draws, losses, moves / (time.perf_counter() - started)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [games]")
+
+    book = generate()
+    write(book)
+    print(f"Wrote {len(book)} positions ({len(book) * book.itemsize} bytes) to {BOOK_FILE}")
+
+    if len(sys.argv) == 2:
+        wins, draws, losses, rate = selfplay(int(sys.argv[1]))
+        print(f"Book won {wins}, drew {draws}, lost {losses}; {rate:.0f} moves per second")
+
+
+if __name__ == "__main__":
+    main()
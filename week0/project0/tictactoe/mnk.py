@@ -0,0 +1,390 @@
+"""
+m,n,k-game engine
+
+Tic Tac Toe generalised to an m x n board where k in a row wins (4x4,
+5x5, gomoku-style 15x15 with k = 5, ...), too big to search to the end.
+The engine is a negamax alpha-beta search with
+
+    iterative deepening  - depth 1, 2, 3, ... until the time limit or max depth,
+                           playing the best move of the last completed depth
+    transposition table  - keyed by a Zobrist hash kept up to date with one XOR
+                           per move, storing depth, bound and best move
+    move ordering        - table move first, then the killer moves of the ply,
+                           then by history score (how often a move caused a cutoff)
+    evaluation           - pluggable; the default scores every k-cell window
+                           that only one player has pieces in
+
+Game exposes the same surface as tictactoe.py (initial_state, player,
+actions, result, winner, terminal, utility, minimax) on boards of X, O and
+EMPTY. The module functions delegate to a default game, set with configure(),
+so `import mnk as ttt` works wherever tictactoe.py does:
+
+    mnk.configure(5, 5, 4)
+"""
+
+import random
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a won position; evaluations must stay well below it
+WIN = 1 << 40
+
+# Transposition table bounds
+EXACT, LOWER, UPPER = range(3)
+
+# Check the clock every this many nodes
+CLOCK_NODES = 1024
+
+# Clear the transposition table between searches once it holds this many positions
+TABLE_SIZE = 1 << 20
+
+
+class Timeout(Exception):
+    pass
+
+
+def window_score(game, cells, player):
+    """
+    Default evaluation for the player to move, 1 (X) or 2 (O): each window
+    of k cells scores 10^count for the player with `count` pieces in it, if
+    their opponent has none there. The game keeps the total for X up to
+    date as moves are played, so `cells` isn't read.
+    """
+    return game.score if player == 1 else -game.score
+
+
+class Game():
+
+    def __init__(self, m=3, n=3, k=3, evaluate=window_score, radius=None, seed=0):
+        """
+        An m-row, n-column board where k in a row wins. Moves searched are
+        limited to empty cells within `radius` of a piece on boards bigger
+        than 5x5, unless `radius` is given; None searches every empty cell.
+
+        evaluate(game, cells, player) scores a position the search stops at
+        for `player` (1 for X, 2 for O) to move, where cells is the flat
+        row-major board of 0 (empty), 1 and 2; scores must stay below WIN / 2.
+        """
+        if k > max(m, n):
+            raise Exception("k must fit on the board")
+        self.m, self.n, self.k = m, n, k
+        self.size = m * n
+        self.evaluate = evaluate
+        self.radius = radius if radius is not None else (1 if self.size > 25 else None)
+
+        # Zobrist keys: one random 64-bit number per cell and piece
+        rng = random.Random(seed)
+        self.zobrist = [[0] * self.size] + [[rng.getrandbits(64) for _ in range(self.size)]
+                                            for _ in range(2)]
+
+        # Every line of k cells, and the windows each cell is in
+        self.windows = []
+        self.directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        for row in range(m):
+            for col in range(n):
+                for dr, dc in self.directions:
+                    end_row, end_col = row + dr * (k - 1), col + dc * (k - 1)
+                    if 0 <= end_row < m and 0 <= end_col < n:
+                        self.windows.append(tuple((row + dr * i) * n + col + dc * i for i in range(k)))
+        self.cell_windows = [[] for _ in range(self.size)]
+        for index, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(index)
+
+        # Each window keeps the sum xs + (k + 1) * os of its pieces,
+        # and window_values scores every possible sum for X
+        self.weights = [0, 1, k + 1]
+        self.window_values = self.values_table()
+
+        self.neighbors = [self.cells_near(cell) for cell in range(self.size)]
+        self.table = {}
+
+    def values_table(self):
+        base = self.k + 1
+        values = [0] * (base * self.k + 1)
+        for xs in range(1, self.k + 1):
+            values[xs] = 10 ** xs
+            values[base * xs] = -10 ** xs
+        return values
+
+    def cells_near(self, cell):
+        if self.radius is None:
+            return []
+        row, col = divmod(cell, self.n)
+        return [r * self.n + c
+                for r in range(max(row - self.radius, 0), min(row + self.radius + 1, self.m))
+                for c in range(max(col - self.radius, 0), min(col + self.radius + 1, self.n))
+                if (r, c) != (row, col)]
+
+    # Board surface, as in tictactoe.py
+
+    def initial_state(self):
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        xs = sum(row.count(X) for row in board)
+        os = sum(row.count(O) for row in board)
+        return X if xs == os else O
+
+    def actions(self, board):
+        return {(i, j) for i in range(self.m) for j in range(self.n) if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        row, col = action
+        if board[row][col] != EMPTY:
+            raise Exception("invalid action")
+        new_board = [list(r) for r in board]
+        new_board[row][col] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        cells = self.encode(board)
+        for window in self.windows:
+            piece = cells[window[0]]
+            if piece and all(cells[cell] == piece for cell in window):
+                return X if piece == 1 else O
+        return None
+
+    def terminal(self, board):
+        return self.winner(board) is not None or all(EMPTY not in row for row in board)
+
+    def utility(self, board):
+        return {X: 1, O: -1, None: 0}[self.winner(board)]
+
+    def minimax(self, board, time_limit=1.0, max_depth=None):
+        """
+        Returns the best action found for the player to move within about
+        `time_limit` seconds (None for no limit), or None if the game is over.
+        """
+        if self.terminal(board):
+            return None
+        move, _, _ = self.search(board, time_limit, max_depth)
+        return divmod(move, self.n)
+
+    # Search
+
+    def encode(self, board):
+        return [1 if piece == X else 2 if piece == O else 0 for row in board for piece in row]
+
+    def search(self, board, time_limit=1.0, max_depth=None):
+        """
+        Iterative deepening search from a non-terminal board. Returns
+        (best cell index, score for the player to move, depth completed).
+        """
+        if len(self.table) > TABLE_SIZE:
+            self.table.clear()
+        cells = self.encode(board)
+        self.owner = [0] * self.size
+        self.near = [0] * self.size
+        self.sums = [0] * len(self.windows)
+        self.score = 0
+        self.hash = 0
+        self.empty = self.size
+        for cell, piece in enumerate(cells):
+            if piece:
+                self.play(cell, piece)
+        to_move = 1 if cells.count(1) == cells.count(2) else 2
+
+        self.killers = [[None, None] for _ in range(self.empty + 1)]
+        self.history = [0] * self.size
+        self.nodes = 0
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+        if max_depth is None:
+            max_depth = self.empty
+        best = (self.ordered_moves(0, None)[0], 0, 0)
+        for depth in range(1, min(max_depth, self.empty) + 1):
+            try:
+                score = self.negamax(to_move, depth, 0, -WIN - 1, WIN + 1)
+            except Timeout:
+                break
+            best = (self.table[self.hash][3], score, depth)
+            if abs(score) > WIN // 2:
+                break
+        return best
+
+    def play(self, cell, piece):
+        self.owner[cell] = piece
+        self.hash ^= self.zobrist[piece][cell]
+        self.empty -= 1
+        for neighbor in self.neighbors[cell]:
+            self.near[neighbor] += 1
+        self.update_windows(cell, self.weights[piece])
+
+    def undo(self, cell, piece):
+        self.owner[cell] = 0
+        self.hash ^= self.zobrist[piece][cell]
+        self.empty += 1
+        for neighbor in self.neighbors[cell]:
+            self.near[neighbor] -= 1
+        self.update_windows(cell, -self.weights[piece])
+
+    def update_windows(self, cell, weight):
+        sums, values = self.sums, self.window_values
+        for window in self.cell_windows[cell]:
+            total = sums[window]
+            self.score += values[total + weight] - values[total]
+            sums[window] = total + weight
+
+    def wins_at(self, cell, piece):
+        """Returns True if `piece` has k in a row through `cell`."""
+        owner, m, n = self.owner, self.m, self.n
+        row, col = divmod(cell, n)
+        for dr, dc in self.directions:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while 0 <= r < m and 0 <= c < n and owner[r * n + c] == piece:
+                    count += 1
+                    r, c = r + sign * dr, c + sign * dc
+            if count >= self.k:
+                return True
+        return False
+
+    def ordered_moves(self, ply, table_move):
+        """
+        Returns the moves to search at `ply`: the table move, the ply's
+        killer moves, then the rest by descending history score.
+        """
+        owner = self.owner
+        if self.radius is None or self.empty == self.size:
+            moves = [cell for cell in range(self.size) if not owner[cell]]
+            if self.empty == self.size and self.radius is not None:
+                moves = [(self.m // 2) * self.n + self.n // 2]
+        else:
+            near = self.near
+            moves = [cell for cell in range(self.size) if not owner[cell] and near[cell]]
+            if not moves:
+                moves = [cell for cell in range(self.size) if not owner[cell]]
+
+        history = self.history
+        moves.sort(key=lambda cell: -history[cell])
+        for first in reversed([table_move] + self.killers[ply]):
+            if first is not None and first in moves:
+                moves.remove(first)
+                moves.insert(0, first)
+        return moves
+
+    def negamax(self, piece, depth, ply, alpha, beta):
+        """
+        Returns the score of the position for `piece`, the player to move,
+        searched `depth` moves deep within the window (alpha, beta).
+        Won positions score WIN less the number of moves to the win.
+        """
+        original_alpha = alpha
+        table_move = None
+        entry = self.table.get(self.hash)
+        if entry is not None:
+            entry_depth, flag, score, table_move = entry
+            score = from_table(score, ply)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                elif flag == UPPER:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        opponent = 3 - piece
+        best_score, best_move = -WIN - 1, None
+        for cell in self.ordered_moves(ply, table_move):
+            self.nodes += 1
+            if self.deadline is not None and self.nodes % CLOCK_NODES == 0:
+                if time.perf_counter() > self.deadline:
+                    raise Timeout
+
+            self.play(cell, piece)
+            if self.wins_at(cell, piece):
+                score = WIN - ply
+            elif self.empty == 0:
+                score = 0
+            elif depth == 1:
+                score = -self.evaluate(self, self.owner, opponent)
+            else:
+                score = -self.negamax(opponent, depth - 1, ply + 1, -beta, -alpha)
+            self.undo(cell, piece)
+
+            if score > best_score:
+                best_score, best_move = score, cell
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                killers = self.killers[ply]
+                if cell != killers[0]:
+                    killers[1], killers[0] = killers[0], cell
+                self.history[cell] += depth * depth
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[self.hash] = (depth, flag, to_table(best_score, ply), best_move)
+        return best_score
+
+
+def to_table(score, ply):
+    """Stores win scores relative to the position rather than the root."""
+    if score > WIN // 2:
+        return score + ply
+    if score < -WIN // 2:
+        return score - ply
+    return score
+
+
+def from_table(score, ply):
+    if score > WIN // 2:
+        return score - ply
+    if score < -WIN // 2:
+        return score + ply
+    return score
+
+
+# Module surface, on a default game
+
+game = Game()
+
+
+def configure(m=3, n=3, k=3, **options):
+    """Sets the board size and win length used by the module functions."""
+    global game
+    game = Game(m, n, k, **options)
+    return game
+
+
+def initial_state():
+    return game.initial_state()
+
+
+def player(board):
+    return game.player(board)
+
+
+def actions(board):
+    return game.actions(board)
+
+
+def result(board, action):
+    return game.result(board, action)
+
+
+def winner(board):
+    return game.winner(board)
+
+
+def terminal(board):
+    return game.terminal(board)
+
+
+def utility(board):
+    return game.utility(board)
+
+
+def minimax(board, time_limit=1.0, max_depth=None):
+    return game.minimax(board, time_limit, max_depth)
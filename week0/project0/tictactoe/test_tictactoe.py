@@ -0,0 +1,150 @@
+import time
+
+import batch
+import bitboard
+import book
+import mnk
+from tictactoe import *
+
+
+def reachable_boards():
+    """Returns every board reachable from the initial state, including terminal ones."""
+    boards = {}
+    stack = [initial_state()]
+    while stack:
+        board = stack.pop()
+        key = str(board)
+        if key in boards:
+            continue
+        boards[key] = board
+        if not terminal(board):
+            stack.extend(result(board, action) for action in actions(board))
+    return list(boards.values())
+
+
+BOARDS = reachable_boards()
+
+
+def search_value(board):
+    """Value of a board by the original alpha-beta search."""
+    if player(board) == X:
+        v, _ = max_value(board)
+    else:
+        v, _ = min_value(board)
+    return v
+
+
+def test_reachable_boards():
+    assert len(BOARDS) == 5478
+
+
+def test_bitboard_values():
+    """
+    GIVEN   every reachable board with at least three moves made
+    WHEN    the bitboard engine values it
+    THEN    it agrees with the original alpha-beta search
+    """
+    for board in BOARDS:
+        if turns_taken(board) >= 3:
+            assert bitboard.value(board) == search_value(board)
+
+
+def test_minimax_plays_optimally():
+    """
+    GIVEN   every reachable non-terminal board
+    WHEN    minimax() picks a move
+    THEN    the move is legal and keeps the value of the position
+    """
+    for board in BOARDS:
+        if terminal(board):
+            assert minimax(board) is None
+            continue
+        move = minimax(board)
+        assert move in actions(board)
+        assert bitboard.value(result(board, move)) == bitboard.value(board)
+
+
+def test_book_covers_positions(tmp_path):
+    """
+    GIVEN   no book file, and every reachable non-terminal board
+    WHEN    the book is loaded, and each board is looked up
+    THEN    the book is generated and written little-endian whatever the machine,
+            loads back the same, and has a move that keeps the value of the position
+    """
+    filename = tmp_path / "book.bin"
+    generated = book.load(filename)
+    assert generated == book.generate() == book.load(filename)
+    with open(filename, "rb") as f:
+        first = f.read(4)
+    assert first == generated[0].to_bytes(4, "little")
+    for board in BOARDS:
+        if terminal(board):
+            continue
+        move = book.lookup(board)
+        assert move in actions(board)
+        assert bitboard.value(result(board, move)) == bitboard.value(board)
+
+
+def test_mnk_plays_optimally():
+    """
+    GIVEN   every reachable non-terminal 3x3 board
+    WHEN    the m,n,k engine searches it with no time limit
+    THEN    its move keeps the value of the position
+    """
+    game = mnk.Game(3, 3, 3)
+    for board in BOARDS:
+        if terminal(board):
+            continue
+        move = game.minimax(board, time_limit=None)
+        assert bitboard.value(result(board, move)) == bitboard.value(board)
+
+
+def test_mnk_wins_and_blocks():
+    """
+    GIVEN   a 5x5 board, 4 in a row to win
+    WHEN    the engine searches positions with a win available, or a threat to block
+    THEN    it takes the win, or blocks the open three
+    """
+    mnk.configure(5, 5, 4)
+    board = mnk.initial_state()
+    for move in [(2, 1), (0, 0), (2, 2), (0, 4), (2, 3), (4, 0)]:
+        board = mnk.result(board, move)
+    assert mnk.player(board) == X
+    assert mnk.minimax(board, time_limit=None, max_depth=1) in {(2, 0), (2, 4)}
+
+    board = mnk.result(board, (4, 4))
+    move = mnk.minimax(board, time_limit=0.5)
+    assert move in {(2, 0), (2, 4)}
+    assert not mnk.terminal(mnk.result(board, move))
+    mnk.configure()
+
+
+def test_mnk_time_limit():
+    """
+    GIVEN   an empty 15x15 gomoku board
+    WHEN    the engine searches with a time limit
+    THEN    it returns a legal move within about that time
+    """
+    game = mnk.Game(15, 15, 5)
+    board = game.result(game.initial_state(), (7, 7))
+    started = time.perf_counter()
+    move = game.minimax(board, time_limit=0.2)
+    assert time.perf_counter() - started < 0.5
+    assert move in game.actions(board)
+
+
+def test_batch_evaluate():
+    """
+    GIVEN   every reachable board, plus duplicates
+    WHEN    the boards are evaluated as one batch over a process pool
+    THEN    values match the bitboard engine in input order, with optimal moves
+    """
+    boards = BOARDS + BOARDS[:100]
+    evaluated = batch.evaluate(boards, processes=2)
+    assert len(evaluated) == len(boards)
+    for board, (value, move) in zip(boards, evaluated):
+        assert value == bitboard.value(board)
+        if terminal(board):
+            assert move is None
+        else:
+            assert bitboard.value(result(board, move)) == value
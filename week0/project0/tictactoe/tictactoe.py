@@ -7,6 +7,9 @@ https://cs50.harvard.edu/ai/2020/projects/0/tictactoe/
 import copy
 import math
 
+import bitboard
+import book
+
 X = "X"
 O = "O"
 EMPTY = None
@@ -109,11 +112,9 @@ def minimax(board):
     if terminal(board):
         return None
 
-    if player(board) == X:
-        _, move = max_value(board)
-    else:
-        _, move = min_value(board)
-
+    move = book.lookup(board)
+    if move is None:
+        move = bitboard.best_move(board)
     return move
 
 
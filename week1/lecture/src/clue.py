@@ -1,5 +1,11 @@
+import os
+import sys
+
 import termcolor
 
+# logic.py and sat.py are the knights project's, shared rather than copied
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "project1", "knights"))
+
 from logic import *
 
 mustard = Symbol("ColMustard")
@@ -22,18 +28,18 @@ symbols = characters + rooms + weapons
 
 def check_knowledge(knowledge):
     for symbol in symbols:
-        if model_check(knowledge, symbol):
+        if knowledge.entails(symbol):
             termcolor.cprint(f"{symbol}: YES", "green")
-        elif not model_check(knowledge, Not(symbol)):
+        elif not knowledge.entails(Not(symbol)):
             print(f"{symbol}: MAYBE")
 
 
 # There must be a person, room, and weapon.
-knowledge = And(
+knowledge = KnowledgeBase(And(
     Or(mustard, plum, scarlet),
     Or(ballroom, kitchen, library),
     Or(knife, revolver, wrench)
-)
+))
 
 # Initial cards
 knowledge.add(And(
@@ -1,3 +1,9 @@
+import os
+import sys
+
+# logic.py and sat.py are the knights project's, shared rather than copied
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "project1", "knights"))
+
 from logic import *
 
 rain = Symbol("rain")
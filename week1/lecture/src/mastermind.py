@@ -1,3 +1,9 @@
+import os
+import sys
+
+# logic.py and sat.py are the knights project's, shared rather than copied
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "project1", "knights"))
+
 from logic import *
 
 colors = ["red", "blue", "green", "yellow"]
@@ -57,6 +63,7 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
+knowledge_base = KnowledgeBase(knowledge)
 for symbol in symbols:
-    if model_check(knowledge, symbol):
+    if knowledge_base.entails(symbol):
         print(symbol)
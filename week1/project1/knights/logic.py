@@ -1,19 +1,124 @@
 import itertools
+import weakref
+
+import sat
 
 
 class Sentence():
+    """
+    Symbol, Not, Or, Implication and Biconditional are interned:
+    constructing one structurally equal to a live sentence returns that
+    same node, so repeated sub-sentences share memory, and each node
+    computes its hash and symbol set once. And can still be extended with
+    add(), so it is mutable, as is any sentence with an And inside it:
+    those aren't shared, and only cache a hash and symbol set that no
+    inner And can change (an And keeps its own up to date as it grows).
+
+    symbols() returns a frozenset, cached on the node, rather than a new
+    set: callers that want to add to it must copy it first.
+    """
+
+    # (class, name or ids of operands) -> the live node with that structure
+    nodes = weakref.WeakValueDictionary()
+
+    # Whether the sentence can change after it is built, and whether
+    # something inside it can, so its hash and symbols can't be cached
+    mutable = False
+    volatile = False
+    hashed = None
+    symbol_set = None
+
+    @classmethod
+    def interned(cls, key, operands, build):
+        """
+        Returns the shared node for `key`, calling build(node) to fill in
+        a new node of class `cls` if there isn't one yet. A node over a
+        mutable operand is built afresh each time and never shared.
+        """
+        if any(operand.mutable for operand in operands):
+            node = object.__new__(cls)
+            build(node)
+            node.mutable = node.volatile = True
+            return node
+        node = Sentence.nodes.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            build(node)
+            Sentence.nodes[key] = node
+        return node
+
+    def __hash__(self):
+        if self.volatile:
+            return self.compute_hash()
+        if self.hashed is None:
+            self.hashed = self.compute_hash()
+        return self.hashed
+
+    def __getstate__(self):
+        # String hashes differ between processes, so a pickled hash is stale
+        state = dict(self.__dict__)
+        state.pop("hashed", None)
+        return state
+
+    def compute_hash(self):
+        raise Exception("nothing to hash")
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
+        return self.value(model, {})
+
+    def value(self, model, cache):
+        """
+        Evaluates the logical sentence, given `cache`: the values of the
+        compound sentences already evaluated in this model, by id, so each
+        shared node is only evaluated once per model.
+        """
         raise Exception("nothing to evaluate")
 
+    def literal(self, cnf):
+        """
+        Returns the CNF literal equivalent to the sentence, adding the
+        clauses that define it to `cnf` (the Tseitin transformation).
+        """
+        raise Exception("nothing to convert")
+
     def formula(self):
         """Returns string formula representing logical sentence."""
         return ""
 
     def symbols(self):
-        """Returns a set of all symbols in the logical sentence."""
-        return set()
+        """Returns a frozen set of all symbols in the logical sentence."""
+        if self.volatile:
+            return self.compute_symbols()
+        if self.symbol_set is None:
+            self.symbol_set = self.compute_symbols()
+        return self.symbol_set
+
+    def compute_symbols(self):
+        return frozenset()
+
+    def code(self, index):
+        """
+        Returns a Python expression for the sentence over an integer model m,
+        where bit index[name] of m is the value of the symbol `name`.
+        """
+        raise Exception("nothing to compile")
+
+    def simplified(self, values):
+        """
+        Returns an equivalent sentence with the symbols in `values` (name ->
+        bool) replaced by their values and constants folded away, nested
+        Ands and Ors flattened and duplicates removed; or True or False if
+        the whole sentence folds to a constant.
+        """
+        raise Exception("nothing to simplify")
+
+    def truth(self, columns):
+        """
+        Returns the sentence's column of a truth table, given the boolean
+        NumPy column of each symbol by name (and of True under key True).
+        """
+        raise Exception("nothing to evaluate")
 
     @classmethod
     def validate(cls, sentence):
@@ -44,68 +149,116 @@ class Sentence():
 
 class Symbol(Sentence):
 
-    def __init__(self, name):
-        self.name = name
+    def __new__(cls, name):
+        def build(node):
+            node.name = name
+        return cls.interned((cls, name), [], build)
+
+    def __reduce__(self):
+        return type(self), (self.name,)
 
     def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+        return self is other or (isinstance(other, Symbol) and self.name == other.name)
 
-    def __hash__(self):
-        return hash(("symbol", self.name))
+    __hash__ = Sentence.__hash__
 
     def __repr__(self):
         return self.name
 
-    def evaluate(self, model):
+    def value(self, model, cache):
         try:
             return bool(model[self.name])
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
+    def truth(self, columns):
+        try:
+            return columns[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
+    def literal(self, cnf):
+        return cnf.variable(self.name)
+
     def formula(self):
         return self.name
 
-    def symbols(self):
-        return {self.name}
+    def compute_hash(self):
+        return hash(("symbol", self.name))
+
+    def compute_symbols(self):
+        return frozenset([self.name])
+
+    def code(self, index):
+        try:
+            return f"m & {1 << index[self.name]}"
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
+    def simplified(self, values):
+        return values.get(self.name, self)
 
 
 class Not(Sentence):
-    def __init__(self, operand):
+    def __new__(cls, operand):
         Sentence.validate(operand)
-        self.operand = operand
+
+        def build(node):
+            node.operand = operand
+        return cls.interned((cls, id(operand)), [operand], build)
+
+    def __reduce__(self):
+        return type(self), (self.operand,)
 
     def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+        return self is other or (isinstance(other, Not) and self.operand == other.operand)
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    __hash__ = Sentence.__hash__
 
     def __repr__(self):
         return f"Not({self.operand})"
 
-    def evaluate(self, model):
-        return not self.operand.evaluate(model)
+    def value(self, model, cache):
+        return not self.operand.value(model, cache)
 
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
-    def symbols(self):
+    def compute_hash(self):
+        return hash(("not", hash(self.operand)))
+
+    def compute_symbols(self):
         return self.operand.symbols()
 
+    def code(self, index):
+        return f"not ({self.operand.code(index)})"
+
+    def simplified(self, values):
+        return negate(self.operand.simplified(values))
+
+    def truth(self, columns):
+        return ~self.operand.truth(columns)
+
+    def literal(self, cnf):
+        return -cnf.literal(self.operand)
+
 
 class And(Sentence):
+    mutable = True
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
+        self.volatile = any(conjunct.mutable for conjunct in conjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
+        return self is other or (isinstance(other, And) and self.conjuncts == other.conjuncts)
 
-    def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+    __hash__ = Sentence.__hash__
+
+    def compute_hash(self):
+        return hash(("and", tuple(hash(conjunct) for conjunct in self.conjuncts)))
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -116,9 +269,18 @@ class And(Sentence):
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
-
-    def evaluate(self, model):
-        return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
+        self.volatile = self.volatile or conjunct.mutable
+        self.hashed = None
+        if self.volatile:
+            self.symbol_set = None
+        elif self.symbol_set is not None:
+            self.symbol_set = self.symbol_set | conjunct.symbols()
+
+    def value(self, model, cache):
+        key = id(self)
+        if key not in cache:
+            cache[key] = all(conjunct.value(model, cache) for conjunct in self.conjuncts)
+        return cache[key]
 
     def formula(self):
         if len(self.conjuncts) == 1:
@@ -126,30 +288,73 @@ class And(Sentence):
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
-    def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+    def compute_symbols(self):
+        return frozenset().union(*[conjunct.symbols() for conjunct in self.conjuncts])
+
+    def code(self, index):
+        if not self.conjuncts:
+            return "True"
+        return " and ".join(f"({conjunct.code(index)})" for conjunct in self.conjuncts)
+
+    def simplified(self, values):
+        conjuncts = {}
+        for conjunct in self.conjuncts:
+            conjunct = conjunct.simplified(values)
+            if conjunct is False:
+                return False
+            if conjunct is not True:
+                for part in conjunct.conjuncts if isinstance(conjunct, And) else [conjunct]:
+                    conjuncts[part] = None
+        if any(negate(conjunct) in conjuncts for conjunct in conjuncts):
+            return False
+        return join(And, list(conjuncts), True)
+
+    def truth(self, columns):
+        if not self.conjuncts:
+            return columns[True]
+        result = self.conjuncts[0].truth(columns)
+        for conjunct in self.conjuncts[1:]:
+            result = result & conjunct.truth(columns)
+        return result
+
+    def literal(self, cnf):
+        literals = [cnf.literal(conjunct) for conjunct in self.conjuncts]
+        node = cnf.new_variable()
+        for literal in literals:
+            cnf.add(-node, literal)
+        cnf.add(node, *[-literal for literal in literals])
+        return node
 
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+
+        def build(node):
+            node.disjuncts = list(disjuncts)
+        return cls.interned((cls, *map(id, disjuncts)), disjuncts, build)
+
+    def __reduce__(self):
+        return type(self), tuple(self.disjuncts)
 
     def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
+        return self is other or (isinstance(other, Or) and self.disjuncts == other.disjuncts)
 
-    def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+    __hash__ = Sentence.__hash__
+
+    def compute_hash(self):
+        return hash(("or", tuple(hash(disjunct) for disjunct in self.disjuncts)))
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
         return f"Or({disjuncts})"
 
-    def evaluate(self, model):
-        return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
+    def value(self, model, cache):
+        key = id(self)
+        if key not in cache:
+            cache[key] = any(disjunct.value(model, cache) for disjunct in self.disjuncts)
+        return cache[key]
 
     def formula(self):
         if len(self.disjuncts) == 1:
@@ -157,75 +362,418 @@ class Or(Sentence):
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
-    def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+    def compute_symbols(self):
+        return frozenset().union(*[disjunct.symbols() for disjunct in self.disjuncts])
+
+    def code(self, index):
+        if not self.disjuncts:
+            return "False"
+        return " or ".join(f"({disjunct.code(index)})" for disjunct in self.disjuncts)
+
+    def simplified(self, values):
+        disjuncts = {}
+        for disjunct in self.disjuncts:
+            disjunct = disjunct.simplified(values)
+            if disjunct is True:
+                return True
+            if disjunct is not False:
+                for part in disjunct.disjuncts if isinstance(disjunct, Or) else [disjunct]:
+                    disjuncts[part] = None
+        if any(negate(disjunct) in disjuncts for disjunct in disjuncts):
+            return True
+        return join(Or, list(disjuncts), False)
+
+    def truth(self, columns):
+        if not self.disjuncts:
+            return ~columns[True]
+        result = self.disjuncts[0].truth(columns)
+        for disjunct in self.disjuncts[1:]:
+            result = result | disjunct.truth(columns)
+        return result
+
+    def literal(self, cnf):
+        literals = [cnf.literal(disjunct) for disjunct in self.disjuncts]
+        node = cnf.new_variable()
+        for literal in literals:
+            cnf.add(node, -literal)
+        cnf.add(-node, *literals)
+        return node
 
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+
+        def build(node):
+            node.antecedent = antecedent
+            node.consequent = consequent
+        return cls.interned((cls, id(antecedent), id(consequent)), [antecedent, consequent], build)
+
+    def __reduce__(self):
+        return type(self), (self.antecedent, self.consequent)
 
     def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
+        return self is other or (isinstance(other, Implication)
+                                 and self.antecedent == other.antecedent
+                                 and self.consequent == other.consequent)
 
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+    __hash__ = Sentence.__hash__
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
 
-    def evaluate(self, model):
-        return ((not self.antecedent.evaluate(model))
-                or self.consequent.evaluate(model))
+    def value(self, model, cache):
+        key = id(self)
+        if key not in cache:
+            cache[key] = ((not self.antecedent.value(model, cache))
+                          or self.consequent.value(model, cache))
+        return cache[key]
 
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
-    def symbols(self):
-        return set.union(self.antecedent.symbols(), self.consequent.symbols())
+    def compute_hash(self):
+        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+
+    def compute_symbols(self):
+        return self.antecedent.symbols() | self.consequent.symbols()
+
+    def code(self, index):
+        return f"not ({self.antecedent.code(index)}) or ({self.consequent.code(index)})"
+
+    def simplified(self, values):
+        antecedent = self.antecedent.simplified(values)
+        consequent = self.consequent.simplified(values)
+        if antecedent is False or consequent is True or antecedent == consequent:
+            return True
+        if antecedent is True:
+            return consequent
+        if consequent is False:
+            return negate(antecedent)
+        return Implication(antecedent, consequent)
+
+    def truth(self, columns):
+        return ~self.antecedent.truth(columns) | self.consequent.truth(columns)
+
+    def literal(self, cnf):
+        antecedent = cnf.literal(self.antecedent)
+        consequent = cnf.literal(self.consequent)
+        node = cnf.new_variable()
+        cnf.add(-node, -antecedent, consequent)
+        cnf.add(node, antecedent)
+        cnf.add(node, -consequent)
+        return node
 
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+
+        def build(node):
+            node.left = left
+            node.right = right
+        return cls.interned((cls, id(left), id(right)), [left, right], build)
+
+    def __reduce__(self):
+        return type(self), (self.left, self.right)
 
     def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
+        return self is other or (isinstance(other, Biconditional)
+                                 and self.left == other.left
+                                 and self.right == other.right)
 
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+    __hash__ = Sentence.__hash__
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
 
-    def evaluate(self, model):
-        return ((self.left.evaluate(model)
-                 and self.right.evaluate(model))
-                or (not self.left.evaluate(model)
-                    and not self.right.evaluate(model)))
+    def value(self, model, cache):
+        key = id(self)
+        if key not in cache:
+            cache[key] = self.left.value(model, cache) == self.right.value(model, cache)
+        return cache[key]
 
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
-    def symbols(self):
-        return set.union(self.left.symbols(), self.right.symbols())
+    def compute_hash(self):
+        return hash(("biconditional", hash(self.left), hash(self.right)))
+
+    def compute_symbols(self):
+        return self.left.symbols() | self.right.symbols()
 
+    def code(self, index):
+        return f"(not ({self.left.code(index)})) is (not ({self.right.code(index)}))"
 
-def model_check(knowledge, query):
+    def simplified(self, values):
+        left = self.left.simplified(values)
+        right = self.right.simplified(values)
+        if isinstance(left, bool):
+            left, right = right, left
+        if isinstance(right, bool):
+            return left if right else negate(left)
+        if left == right:
+            return True
+        return Biconditional(left, right)
+
+    def truth(self, columns):
+        return self.left.truth(columns) == self.right.truth(columns)
+
+    def literal(self, cnf):
+        left = cnf.literal(self.left)
+        right = cnf.literal(self.right)
+        node = cnf.new_variable()
+        cnf.add(-node, -left, right)
+        cnf.add(-node, left, -right)
+        cnf.add(node, left, right)
+        cnf.add(node, -left, -right)
+        return node
+
+
+def compile_sentence(sentence, symbols):
+    """
+    Returns a function evaluating the sentence on an integer model, where
+    bit i of the model is the value of symbols[i]. The sentence is compiled
+    to a single Python expression, so evaluating it walks no objects; if
+    it is nested too deeply for that, the function falls back to evaluate().
+    """
+    index = {symbol: i for i, symbol in enumerate(symbols)}
+    try:
+        return eval(f"lambda m: bool({sentence.code(index)})")
+    except (SyntaxError, RecursionError, MemoryError):
+        def evaluate(m):
+            return sentence.evaluate({symbol: bool(m >> i & 1) for symbol, i in index.items()})
+        return evaluate
+
+
+class CNF():
+    """
+    A formula in conjunctive normal form, built up in a SAT solver: each
+    symbol is a solver variable, and each compound sentence gets a new
+    variable constrained to be equivalent to it, so the clauses grow
+    linearly with the size of the sentences rather than exponentially.
+    """
+
+    def __init__(self):
+        self.solver = sat.Solver()
+        self.variables = {}
+        self.literals = {}
+
+    def variable(self, name):
+        """Returns the solver variable for the symbol `name`."""
+        if name not in self.variables:
+            self.variables[name] = self.solver.new_variable()
+        return self.variables[name]
+
+    def new_variable(self):
+        return self.solver.new_variable()
+
+    def add(self, *literals):
+        self.solver.add_clause(literals)
+
+    def literal(self, sentence):
+        """Returns the literal for a sentence, converting each distinct sentence once."""
+        if sentence not in self.literals:
+            self.literals[sentence] = sentence.literal(self)
+        return self.literals[sentence]
+
+    def require(self, sentence):
+        """Adds the sentence as a constraint: conjuncts of an And are each required."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.require(conjunct)
+        elif isinstance(sentence, Not) and isinstance(sentence.operand, Or):
+            for disjunct in sentence.operand.disjuncts:
+                self.require(Not(disjunct))
+        elif isinstance(sentence, Or):
+            self.add(*[self.literal(disjunct) for disjunct in sentence.disjuncts])
+        else:
+            self.add(self.literal(sentence))
+
+    def satisfiable(self):
+        return self.solver.solve() is not None
+
+
+class KnowledgeBase():
+    """
+    A knowledge base that answers many entailment queries, keeping what it
+    has worked out between them. With the `models` backend its satisfying
+    models are enumerated once, a conjunct at a time: each new conjunct
+    extends the models with any symbols it introduces and drops those it
+    doesn't hold in. With the `sat` backend it is kept in one incremental
+    SAT solver, and each query is a solve under an assumption.
+
+    Conjuncts appended to the knowledge with And.add (or KnowledgeBase.add)
+    are taken in at the next query; conjuncts already taken in must not change.
+    """
+
+    def __init__(self, knowledge=None, backend="models"):
+        if backend not in ["models", "sat"]:
+            raise ValueError(f"unknown backend {backend}, expected models or sat")
+        self.knowledge = knowledge if knowledge is not None else And()
+        self.backend = backend
+        self.incorporated = 0
+
+        # Bit i of each model is the value of symbols[i]
+        self.symbols = []
+        self.models = [0]
+        self.cnf = CNF() if backend == "sat" else None
+
+    def conjuncts(self):
+        if isinstance(self.knowledge, And):
+            return self.knowledge.conjuncts
+        return [self.knowledge]
+
+    def add(self, sentence):
+        if not isinstance(self.knowledge, And):
+            self.knowledge = And(self.knowledge)
+        self.knowledge.add(sentence)
+
+    def update(self):
+        """Takes in the conjuncts added to the knowledge since the last update."""
+        conjuncts = self.conjuncts()
+        for conjunct in conjuncts[self.incorporated:]:
+            if self.cnf is not None:
+                self.cnf.require(conjunct)
+            else:
+                self.restrict(conjunct)
+        self.incorporated = len(conjuncts)
+
+    def restrict(self, sentence):
+        """Keeps only the models `sentence` holds in."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.restrict(conjunct)
+            return
+
+        new_symbols = sorted(sentence.symbols() - set(self.symbols))
+        if new_symbols:
+            shift = len(self.symbols)
+            self.models = [model | extension << shift
+                           for model in self.models
+                           for extension in range(1 << len(new_symbols))]
+            self.symbols.extend(new_symbols)
+        self.models = list(filter(compile_sentence(sentence, self.symbols), self.models))
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        self.update()
+        if self.cnf is not None:
+            return self.cnf.solver.solve([-self.cnf.literal(query)]) is None
+
+        # Symbols the knowledge doesn't mention can take either value
+        new_symbols = sorted(query.symbols() - set(self.symbols))
+        holds = compile_sentence(query, self.symbols + new_symbols)
+        shift = len(self.symbols)
+        return all(holds(model | extension << shift)
+                   for model in self.models
+                   for extension in range(1 << len(new_symbols)))
+
+
+def negate(sentence):
+    """Returns the negation of a sentence or constant, without double negation."""
+    if isinstance(sentence, bool):
+        return not sentence
+    if isinstance(sentence, Not):
+        return sentence.operand
+    return Not(sentence)
+
+
+def join(kind, sentences, empty):
+    """Returns And or Or of simplified sentences: the constant `empty` if there are none."""
+    if not sentences:
+        return empty
+    if len(sentences) == 1:
+        return sentences[0]
+    return kind(*sentences)
+
+
+def constant(value):
+    """Returns a sentence for True or False (an empty And or Or), or `value` if it is a sentence."""
+    if value is True:
+        return And()
+    if value is False:
+        return Or()
+    return value
+
+
+def simplify(knowledge):
+    """
+    Returns (knowledge, values): the knowledge simplified, True or False
+    if it folds to a constant, and the symbol values it fixes. Conjuncts
+    that are a lone symbol or its negation fix that symbol's value, which
+    is substituted through the rest of the knowledge, repeatedly until no
+    new values are fixed.
+    """
+    values = {}
+    while True:
+        knowledge = knowledge.simplified(values)
+        if isinstance(knowledge, bool):
+            return knowledge, values
+
+        units = {}
+        for conjunct in knowledge.conjuncts if isinstance(knowledge, And) else [knowledge]:
+            if isinstance(conjunct, Symbol):
+                name, value = conjunct.name, True
+            elif isinstance(conjunct, Not) and isinstance(conjunct.operand, Symbol):
+                name, value = conjunct.operand.name, False
+            else:
+                continue
+            if units.get(name, value) != value:
+                return False, values
+            units[name] = value
+        if not units:
+            return knowledge, values
+        values.update(units)
+
+
+# Rows of the truth table evaluated at once by model_check_numpy
+CHUNK_BITS = 20
+
+
+def model_check(knowledge, query, backend="compiled", simplified=True):
+    """
+    Checks if knowledge base entails query, with the named backend:
+
+        compiled  - each assignment in turn, on a compiled sentence
+        numpy     - the whole truth table as NumPy arrays, in chunks
+        sat       - knowledge and not query shown unsatisfiable by a SAT solver
+        recursive - each assignment in turn, evaluating the sentence objects
+
+    Unless `simplified` is False, the knowledge is simplified first and the
+    symbol values it fixes substituted into the query, so the backend only
+    enumerates the symbols still free.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend}, expected one of {', '.join(BACKENDS)}")
+    if simplified:
+        knowledge, values = simplify(knowledge)
+        if knowledge is False:
+            return True
+        query = query.simplified(values)
+        if query is True:
+            return True
+        knowledge, query = constant(knowledge), constant(query)
+    return BACKENDS[backend](knowledge, query)
+
+
+def model_check_compiled(knowledge, query):
+    """
+    Checks if knowledge base entails query: that no assignment of the
+    symbols, counted through as integers, makes knowledge true and query false.
+    """
+    symbols = sorted(knowledge.symbols() | query.symbols())
+    counterexample = compile_sentence(And(knowledge, Not(query)), symbols)
+    return not any(map(counterexample, range(1 << len(symbols))))
+
+
+def model_check_recursive(knowledge, query):
     """Checks if knowledge base entails query."""
 
     def check_all(knowledge, query, symbols, model):
@@ -257,7 +805,61 @@ def model_check(knowledge, query):
                     check_all(knowledge, query, remaining, model_false))
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    symbols = set(knowledge.symbols() | query.symbols())
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
+
+
+def model_check_numpy(knowledge, query):
+    """
+    Checks if knowledge base entails query over the whole truth table at
+    once: each symbol is a boolean column of bit patterns and each sentence
+    an array operation. The table is built 2^CHUNK_BITS rows at a time to
+    bound memory, stopping at the first chunk with a counterexample.
+    """
+    import numpy as np
+
+    symbols = sorted(knowledge.symbols() | query.symbols())
+    low_bits = min(len(symbols), CHUNK_BITS)
+    rows = np.arange(1 << low_bits, dtype=np.int64)
+
+    # Symbols below bit low_bits repeat the same pattern in every chunk,
+    # the rest are constant within a chunk
+    low_columns = {symbol: (rows >> i & 1).astype(bool) for i, symbol in enumerate(symbols[:low_bits])}
+    true = np.ones(len(rows), dtype=bool)
+    false = ~true
+
+    for chunk in range(1 << (len(symbols) - low_bits)):
+        columns = dict(low_columns)
+        for i, symbol in enumerate(symbols[low_bits:]):
+            columns[symbol] = true if chunk >> i & 1 else false
+        columns[True] = true
+
+        holds = knowledge.truth(columns)
+        if not holds.any():
+            continue
+        if (holds & ~query.truth(columns)).any():
+            return False
+    return True
+
+
+def model_check_sat(knowledge, query):
+    """
+    Checks if knowledge base entails query: that knowledge and not query,
+    converted to CNF, is unsatisfiable. Scales to far more symbols than
+    enumerating models, as the solver only explores assignments that
+    conflict analysis hasn't already ruled out.
+    """
+    cnf = CNF()
+    cnf.require(knowledge)
+    cnf.require(Not(query))
+    return not cnf.satisfiable()
+
+
+BACKENDS = {
+    "compiled": model_check_compiled,
+    "numpy": model_check_numpy,
+    "sat": model_check_sat,
+    "recursive": model_check_recursive
+}
@@ -0,0 +1,288 @@
+"""
+CDCL SAT solver
+
+Decides satisfiability of a formula in conjunctive normal form, given as
+clauses of non-zero integer literals: variable v is the literal v, and its
+negation -v (the DIMACS convention). The solver is conflict-driven clause
+learning on top of DPLL:
+
+    unit propagation    - two watched literals per clause, so only clauses
+                          watching a literal that just became false are visited
+    clause learning     - each conflict is analysed back to its first unique
+                          implication point, and the learnt clause is kept
+    backjumping         - straight back to the second highest level in the
+                          learnt clause, rather than undoing one decision
+    branching           - the unassigned variable most active in recent
+                          conflicts, with its last value (phase saving)
+    restarts            - after a geometrically growing number of conflicts
+
+Clauses can be added between calls to solve(), and solve() takes
+assumptions, so one Solver can answer many related questions. This module
+is self-contained, so the same file serves both logic.py copies.
+"""
+
+import heapq
+from collections import defaultdict
+
+# Activity decay per conflict, and conflicts before the first restart
+DECAY = 0.95
+RESTART_CONFLICTS = 100
+
+
+class Solver():
+
+    def __init__(self, num_variables=0):
+        self.num_variables = 0
+        self.values = [0]       # variable -> 1 true, -1 false, 0 unassigned
+        self.levels = [0]       # variable -> decision level it was assigned at
+        self.reasons = [None]   # variable -> clause that implied it, or None
+        self.activity = [0.0]
+        self.phase = [-1]
+        self.increment = 1.0
+        self.heap = []
+
+        self.watches = defaultdict(list)  # literal -> clauses watching it
+        self.clauses = []
+        self.learnts = []
+        self.trail = []
+        self.trail_limits = []  # index in trail where each decision level starts
+        self.head = 0           # trail index of the next literal to propagate
+        self.ok = True
+
+        for _ in range(num_variables):
+            self.new_variable()
+
+    def new_variable(self):
+        """Adds a variable, returning its number."""
+        self.num_variables += 1
+        self.values.append(0)
+        self.levels.append(0)
+        self.reasons.append(None)
+        self.activity.append(0.0)
+        self.phase.append(-1)
+        heapq.heappush(self.heap, (0.0, self.num_variables))
+        return self.num_variables
+
+    def value(self, literal):
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def add_clause(self, literals):
+        """
+        Adds a clause. Returns False if the formula is now unsatisfiable.
+        """
+        self.backtrack(0)
+        if not self.ok:
+            return False
+
+        clause = []
+        for literal in dict.fromkeys(literals):
+            if abs(literal) > self.num_variables:
+                raise Exception(f"variable {abs(literal)} not in solver")
+            if -literal in clause or self.value(literal) == 1:
+                return True
+            if self.value(literal) == 0:
+                clause.append(literal)
+
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self.enqueue(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.clauses.append(clause)
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+        return self.ok
+
+    def enqueue(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = 1 if literal > 0 else -1
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns every literal implied by unit clauses. Returns a clause
+        made false by the assignment, or None if there is no conflict.
+        """
+        watches, value = self.watches, self.value
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            watchers = watches[false_literal]
+            watches[false_literal] = kept = []
+
+            for i, clause in enumerate(watchers):
+                # Keep the false watch in clause[1]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if value(first) == 1:
+                    kept.append(clause)
+                    continue
+
+                # Look for another literal that isn't false to watch
+                for k in range(2, len(clause)):
+                    if value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value(first) == -1:
+                        kept.extend(watchers[i + 1:])
+                        self.head = len(self.trail)
+                        return clause
+                    self.enqueue(first, clause)
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns (learnt clause, level to backjump to) for a conflict: the
+        clause of the first unique implication point, with the literal
+        asserted after backjumping first and the one to watch second.
+        """
+        level = len(self.trail_limits)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learnt.append(other)
+
+            # The most recently assigned literal in the conflict at this level
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            seen.discard(abs(literal))
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+
+        learnt[0] = -literal
+        if len(learnt) == 1:
+            return learnt, 0
+        second = max(range(1, len(learnt)), key=lambda i: self.levels[abs(learnt[i])])
+        learnt[1], learnt[second] = learnt[second], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_variables + 1)]
+            heapq.heapify(self.heap)
+        heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def backtrack(self, level):
+        """Undoes every assignment above decision level `level`."""
+        if len(self.trail_limits) <= level:
+            return
+        limit = self.trail_limits[level]
+        for literal in self.trail[limit:]:
+            variable = abs(literal)
+            self.phase[variable] = self.values[variable]
+            self.values[variable] = 0
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[limit:]
+        del self.trail_limits[level:]
+        self.head = limit
+
+    def decide(self):
+        """Returns the most active unassigned variable, or None if all are assigned."""
+        if len(self.heap) > 10 * self.num_variables + 100:
+            self.heap = [(-self.activity[v], v) for v in range(1, self.num_variables + 1)
+                         if not self.values[v]]
+            heapq.heapify(self.heap)
+        while self.heap:
+            _, variable = heapq.heappop(self.heap)
+            if not self.values[variable]:
+                return variable
+        return None
+
+    def solve(self, assumptions=()):
+        """
+        Returns a satisfying assignment {variable: bool} of the clauses with
+        every literal in `assumptions` true, or None if there is none.
+        """
+        self.backtrack(0)
+        if not self.ok:
+            return None
+        if self.propagate() is not None:
+            self.ok = False
+            return None
+
+        conflicts, restart = 0, RESTART_CONFLICTS
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.trail_limits:
+                    self.ok = False
+                    return None
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self.enqueue(learnt[0], learnt)
+                self.increment /= DECAY
+                conflicts += 1
+                continue
+
+            if conflicts >= restart:
+                conflicts, restart = 0, int(restart * 1.5)
+                self.backtrack(0)
+                continue
+
+            # Assumptions are the first decisions, one per level
+            level = len(self.trail_limits)
+            if level < len(assumptions):
+                literal = assumptions[level]
+                if self.value(literal) == -1:
+                    self.backtrack(0)
+                    return None
+                self.trail_limits.append(len(self.trail))
+                if self.value(literal) == 0:
+                    self.enqueue(literal, None)
+                continue
+
+            variable = self.decide()
+            if variable is None:
+                model = {v: self.values[v] == 1 for v in range(1, self.num_variables + 1)}
+                self.backtrack(0)
+                return model
+            self.trail_limits.append(len(self.trail))
+            self.enqueue(variable if self.phase[variable] == 1 else -variable, None)
+
+
+def solve(clauses, num_variables):
+    """
+    Returns a satisfying assignment {variable: bool} for a list of clauses
+    over variables 1 to num_variables, or None if they are unsatisfiable.
+    """
+    solver = Solver(num_variables)
+    for clause in clauses:
+        if not solver.add_clause(clause):
+            return None
+    return solver.solve()
@@ -0,0 +1,239 @@
+import itertools
+import random
+
+import sat
+from logic import *
+
+SYMBOLS = [Symbol(name) for name in "abcde"]
+
+
+def random_sentence(rng, depth=3):
+    """Returns a random sentence over SYMBOLS, nested up to `depth` deep."""
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(SYMBOLS)
+    kind = rng.choice([Not, And, Or, Implication, Biconditional])
+    if kind is Not:
+        return Not(random_sentence(rng, depth - 1))
+    if kind in (And, Or):
+        return kind(*[random_sentence(rng, depth - 1) for _ in range(rng.randint(1, 3))])
+    return kind(random_sentence(rng, depth - 1), random_sentence(rng, depth - 1))
+
+
+def sentences(count=300, seed=0):
+    rng = random.Random(seed)
+    return [random_sentence(rng) for _ in range(count)]
+
+
+def test_compiled_sentences():
+    """
+    GIVEN   random sentences
+    WHEN    each is compiled to a function of an integer model
+    THEN    it agrees with evaluate() on every model
+    """
+    names = [symbol.name for symbol in SYMBOLS]
+    for sentence in sentences():
+        compiled = compile_sentence(sentence, names)
+        for m in range(1 << len(names)):
+            model = {name: bool(m >> i & 1) for i, name in enumerate(names)}
+            assert compiled(m) == sentence.evaluate(model)
+
+
+def test_model_check():
+    """
+    GIVEN   random knowledge bases and queries
+    WHEN    entailment is model checked
+    THEN    the compiled checker agrees with the recursive one
+    """
+    for knowledge, query in zip(sentences(seed=1), sentences(seed=2)):
+        expected = model_check_recursive(knowledge, query)
+        for backend, simplified in itertools.product(BACKENDS, [True, False]):
+            assert model_check(knowledge, query, backend, simplified) == expected
+
+
+def test_simplify():
+    """
+    GIVEN   knowledge with nested Ands, duplicates and unit facts
+    WHEN    it is simplified
+    THEN    the units are fixed and substituted away, leaving only free symbols
+    """
+    a, b, c, d = SYMBOLS[:4]
+    knowledge = And(
+        And(a, Not(b)),
+        Or(a, c),
+        Implication(a, Or(c, d, b)),
+        Implication(a, Or(c, d, b)),
+        Biconditional(d, Not(b))
+    )
+    simplified, values = simplify(knowledge)
+    assert values == {"a": True, "b": False, "d": True}
+    assert simplified is True
+
+    simplified, values = simplify(And(Or(a, b), Or(a, Or(b, a)), Not(Not(c))))
+    assert values == {"c": True}
+    assert simplified == Or(a, b)
+
+    assert simplify(And(a, Implication(a, b), Not(b)))[0] is False
+    assert And(a, Not(a)).simplified({}) is False
+    assert Or(b, Not(b)).simplified({}) is True
+    for sentence in sentences(seed=5):
+        for m in range(1 << len(SYMBOLS)):
+            model = {symbol.name: bool(m >> i & 1) for i, symbol in enumerate(SYMBOLS)}
+            simplified = sentence.simplified({"a": model["a"]})
+            if isinstance(simplified, bool):
+                assert simplified == sentence.evaluate(model)
+            else:
+                assert simplified.evaluate(model) == sentence.evaluate(model)
+
+
+def test_numpy_chunks():
+    """
+    GIVEN   a knowledge base with more symbols than one truth table chunk
+    WHEN    it is model checked with the numpy backend
+    THEN    entailment is decided across chunks
+    """
+    names = [Symbol(f"s{i}") for i in range(CHUNK_BITS + 2)]
+    knowledge = And(*[Implication(a, b) for a, b in zip(names, names[1:])], names[0])
+    assert model_check(knowledge, names[-1], backend="numpy")
+    assert not model_check(And(*names[:-1]), names[-1], backend="numpy")
+
+
+def test_puzzles():
+    import puzzle
+    assert model_check(puzzle.knowledge0, puzzle.AKnave)
+    assert model_check(puzzle.knowledge3, puzzle.AKnight)
+    assert model_check(puzzle.knowledge3, puzzle.BKnave)
+    assert model_check(puzzle.knowledge3, puzzle.CKnight)
+    assert not model_check(puzzle.knowledge3, puzzle.AKnave)
+
+
+def test_knowledge_base():
+    """
+    GIVEN   knowledge bases that grow a conjunct at a time
+    WHEN    they are queried between additions
+    THEN    each backend agrees with model checking the knowledge as it stands
+    """
+    for backend, seed in itertools.product(["models", "sat"], range(20)):
+        additions = sentences(count=6, seed=2 * seed + 100)
+        queries = sentences(count=6, seed=2 * seed + 101)
+        knowledge = And()
+        knowledge_base = KnowledgeBase(knowledge, backend)
+        for i, (addition, query) in enumerate(zip(additions, queries)):
+            if i % 2:
+                knowledge.add(addition)
+            else:
+                knowledge_base.add(addition)
+            for sentence in [query, Not(query)] + SYMBOLS:
+                assert knowledge_base.entails(sentence) == model_check(knowledge, sentence)
+
+
+def test_sat_solver():
+    """
+    GIVEN   random small CNF formulas
+    WHEN    they are solved, with and without assumptions
+    THEN    the solver finds a model exactly when brute force does, and its models hold
+    """
+    rng = random.Random(0)
+
+    def satisfiable(clauses, n):
+        return any(all(any((literal > 0) == bool(m >> (abs(literal) - 1) & 1) for literal in clause)
+                       for clause in clauses)
+                   for m in range(1 << n))
+
+    for _ in range(500):
+        n = rng.randint(1, 8)
+        clauses = [[rng.choice([1, -1]) * rng.randint(1, n) for _ in range(rng.randint(1, 3))]
+                   for _ in range(rng.randint(1, 30))]
+        solver = sat.Solver(n)
+        for clause in clauses:
+            solver.add_clause(clause)
+
+        model = solver.solve()
+        assert (model is not None) == satisfiable(clauses, n)
+        if model is not None:
+            assert all(any(model[abs(literal)] == (literal > 0) for literal in clause)
+                       for clause in clauses)
+
+        assumption = rng.choice([1, -1]) * rng.randint(1, n)
+        assert (solver.solve([assumption]) is not None) == satisfiable(clauses + [[assumption]], n)
+
+
+def test_sat_many_symbols():
+    """
+    GIVEN   a chain of implications over far too many symbols to enumerate
+    WHEN    entailment is checked with the sat backend
+    THEN    it is decided
+    """
+    names = [Symbol(f"s{i}") for i in range(300)]
+    knowledge = And(*[Implication(a, b) for a, b in zip(names, names[1:])], names[0])
+    assert model_check(knowledge, names[-1], backend="sat")
+    assert not model_check(knowledge, Not(names[-1]), backend="sat")
+    assert not model_check(And(*names[1:]), names[0], backend="sat")
+
+
+def test_interned_sentences():
+    """
+    GIVEN   sentences built twice from the same parts
+    WHEN    they are compared, hashed and extended
+    THEN    equal immutable sentences are one node, with a frozen set of symbols,
+            and And keeps its cached symbols up to date
+    """
+    a, b = Symbol("a"), Symbol("b")
+    assert Symbol("a") is a
+    assert Not(Symbol("a")) is Not(a)
+    assert Implication(a, Not(b)) is Implication(Symbol("a"), Not(Symbol("b")))
+    assert Biconditional(a, b) is not Biconditional(b, a)
+    assert Or(a, Not(b)) is Or(Symbol("a"), Not(Symbol("b")))
+    assert Or(a, b) is not Or(b, a) and Or(a, b) == Or(a, b)
+    assert isinstance(Or(a, b).symbols(), frozenset)
+
+    knowledge = And(a)
+    before = hash(knowledge)
+    knowledge.add(Or(b, Symbol("c")))
+    assert knowledge.symbols() == {"a", "b", "c"}
+    assert hash(knowledge) != before
+    assert hash(knowledge) == hash(And(a, Or(b, Symbol("c"))))
+    assert knowledge.evaluate({"a": True, "b": False, "c": True})
+
+
+def test_mutated_inner_and():
+    """
+    GIVEN   sentences built over an And that is extended afterwards
+    WHEN    they are hashed, compared and model checked
+    THEN    they see the new conjuncts, and aren't shared with sentences over other Ands
+    """
+    a, b, d = Symbol("A"), Symbol("B"), Symbol("D")
+    inner = And(a)
+    outer = And(inner, Or(a, b))
+    negated = Not(inner)
+    inner.add(Implication(a, d))
+    inner.add(Implication(d, b))
+    assert outer.symbols() == {"A", "B", "D"}
+    for backend in BACKENDS:
+        assert model_check(outer, b, backend, simplified=False)
+
+    copy = And(a, Implication(a, d), Implication(d, b))
+    assert negated == Not(copy) and hash(negated) == hash(Not(copy))
+    assert Not(inner) is not negated
+    assert Or(inner, b) is not Or(inner, b)
+    assert Not(a) is Not(a)
+
+
+def test_copy_and_pickle():
+    """
+    GIVEN   knowledge with interned and mutable sentences
+    WHEN    it is deep copied, or pickled and loaded
+    THEN    the copy is equal, shares the interned nodes, and its Ands can be extended on their own
+    """
+    import copy
+    import pickle
+
+    a, b = Symbol("a"), Symbol("b")
+    knowledge = And(a, Implication(a, Not(b)), Or(b, Not(And(a))), Biconditional(a, b))
+    for duplicate in [copy.deepcopy(knowledge), pickle.loads(pickle.dumps(knowledge))]:
+        assert duplicate == knowledge and hash(duplicate) == hash(knowledge)
+        assert duplicate is not knowledge
+        assert duplicate.conjuncts[1] is knowledge.conjuncts[1]
+        duplicate.add(b)
+        assert duplicate.symbols() == knowledge.symbols()
+        assert duplicate != knowledge and len(knowledge.conjuncts) == 4
+    assert pickle.loads(pickle.dumps(a)) is a
@@ -0,0 +1,264 @@
+"""
+Exact mine probabilities for the Minesweeper frontier
+
+The frontier is every undetermined cell mentioned by a sentence. Sentences
+that share cells are linked, and each group of linked sentences (a component)
+is independent of the others given how many mines it holds, so each is
+enumerated on its own: its cells are assigned one at a time, in the order
+a breadth-first search through the sentences reaches them, and partial
+assignments that leave every sentence needing the same number of mines are
+merged (memoised), so work grows with the number of distinct states rather
+than the number of configurations.
+
+Each component yields a polynomial: ways[k] consistent configurations with
+k mines, and for each cell the ways it is a mine. Components are combined
+with the cells no sentence mentions through the global mine count: a
+configuration with k frontier mines leaves C(unconstrained, mines left - k)
+ways to place the rest.
+
+A component whose enumeration would need more than MAX_STATES states at
+once is estimated instead, each cell from the ratio of mines to cells of
+the sentences it is in, and counted as holding the mines that estimate
+implies. Results are cached per component between calls, since most
+moves change only one component.
+"""
+
+from collections import deque
+from math import comb
+
+# Most distinct states a step of a component's enumeration may have before
+# the component is estimated instead; each costs a dict entry and a
+# polynomial, and a dense board's frontier can otherwise reach millions
+MAX_STATES = 2000
+
+
+def components(sentences):
+    """
+    Returns the connected components of a list of (cells, count) sentences,
+    as lists of sentence indices, linked through shared cells.
+    """
+    containing = {}
+    for index, (cells, _) in enumerate(sentences):
+        for cell in cells:
+            containing.setdefault(cell, []).append(index)
+
+    seen = set()
+    result = []
+    for start in range(len(sentences)):
+        if start in seen:
+            continue
+        seen.add(start)
+        component = []
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            component.append(index)
+            for cell in sentences[index][0]:
+                for other in containing[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        queue.append(other)
+        result.append(component)
+    return result
+
+
+def add(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    return [x + (b[i] if i < len(b) else 0) for i, x in enumerate(a)]
+
+
+def multiply(a, b):
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return result
+
+
+def shift(a):
+    """Multiplies a polynomial by x: one more mine."""
+    return [0] + a
+
+
+def enumerate_component(sentences):
+    """
+    Counts the mine configurations consistent with a component's sentences.
+    Returns (cells, ways, cell_ways): ways[k] configurations with k mines,
+    and cell_ways[i][k] of those with cells[i] a mine; or None if some step
+    of the enumeration has more than MAX_STATES distinct states.
+    """
+    # Cells in breadth-first order, so few sentences are open at once
+    position = {}
+    for cell_set, _ in sentences:
+        for cell in sorted(cell_set):
+            position.setdefault(cell, len(position))
+    cells = list(position)
+
+    # For each cell, the sentences it is in and the sentences it is the last
+    # cell of; and the sentences still open once it has been assigned
+    member = [[] for _ in cells]
+    last = [[] for _ in cells]
+    bounds = []
+    for index, (cell_set, _) in enumerate(sentences):
+        positions = [position[cell] for cell in cell_set]
+        for i in positions:
+            member[i].append(index)
+        last[max(positions)].append(index)
+        bounds.append((min(positions), max(positions)))
+    counts = [count for _, count in sentences]
+    open_after = [[] for _ in cells]
+    for index, (first, final) in enumerate(bounds):
+        for i in range(first, final):
+            open_after[i].append(index)
+
+    def step(state, i, mine):
+        """
+        Returns the state after assigning cells[i]: the mines still to place
+        in each sentence open after it, or None if that breaks a sentence.
+        """
+        remaining = dict(zip(open_after[i - 1], state)) if i else {}
+        for index in member[i]:
+            left = remaining.get(index, counts[index]) - mine
+            if left < 0:
+                return None
+            remaining[index] = left
+        for index in last[i]:
+            if remaining[index]:
+                return None
+        return tuple(remaining.get(index, counts[index]) for index in open_after[i])
+
+    # Forward pass: layers[i] maps each state before assigning cells[i]
+    # to its ways by mine count
+    layers = [{(): [1]}]
+    for i in range(len(cells)):
+        layer = {}
+        for state, ways in layers[-1].items():
+            for mine in (0, 1):
+                next_state = step(state, i, mine)
+                if next_state is not None:
+                    layer[next_state] = add(layer.get(next_state, []), shift(ways) if mine else ways)
+        if len(layer) > MAX_STATES:
+            return None
+        layers.append(layer)
+
+    # Backward pass: completions[state] counts the ways to finish from a state
+    completions = {state: [1] for state in layers[-1]}
+    cell_ways = [None] * len(cells)
+    for i in reversed(range(len(cells))):
+        previous = {}
+        mine_ways = []
+        for state, ways in layers[i].items():
+            total = []
+            for mine in (0, 1):
+                next_state = step(state, i, mine)
+                if next_state is None or next_state not in completions:
+                    continue
+                rest = completions[next_state]
+                if mine:
+                    rest = shift(rest)
+                    mine_ways = add(mine_ways, multiply(ways, rest))
+                total = add(total, rest)
+            if total:
+                previous[state] = total
+        completions = previous
+        cell_ways[i] = mine_ways
+    return cells, completions.get((), []), cell_ways
+
+
+def estimate_component(sentences):
+    """
+    Approximates a component too large to enumerate: each cell's probability
+    is the mean over its sentences of count / cells, and the component is
+    taken to hold the expected number of mines that gives. Returns
+    (cells, ways, probabilities) with ways a polynomial of a single term.
+    """
+    ratios = {}
+    for cell_set, count in sentences:
+        for cell in cell_set:
+            ratios.setdefault(cell, []).append(count / len(cell_set))
+    cells = list(ratios)
+    estimates = [sum(ratios[cell]) / len(ratios[cell]) for cell in cells]
+    return cells, [0] * round(sum(estimates)) + [1], estimates
+
+
+def probabilities(sentences, unknown, mines_left=None, cache=None):
+    """
+    Returns (cell -> probability of a mine, probability for any unconstrained
+    cell) given a list of (cells, count) sentences over undetermined cells,
+    the number of undetermined cells in total, and the number of mines not
+    yet found. Without mines_left, components are weighted only by their own
+    configurations and the unconstrained probability is None.
+
+    `cache`, a dict kept between calls, holds each component's enumeration
+    by its sentences, so only components whose sentences changed are redone;
+    it is left holding just the components of this call.
+    """
+    sentences = [(frozenset(cells), count) for cells, count in sentences if cells]
+    used = {}
+    groups = []
+    for component in components(sentences):
+        key = frozenset(sentences[i] for i in component)
+        if cache is not None and key in cache:
+            group = cache[key]
+        else:
+            part = [sentences[i] for i in component]
+            exact = enumerate_component(part)
+            if exact is not None:
+                group = (*exact, None)
+            else:
+                cells, ways, estimates = estimate_component(part)
+                group = (cells, ways, None, estimates)
+        used[key] = group
+        groups.append(group)
+    if cache is not None:
+        cache.clear()
+        cache.update(used)
+    frontier = sum(len(group[0]) for group in groups)
+    unconstrained = unknown - frontier
+
+    # placements[k] = C(unconstrained, mines_left - k), each from the one
+    # before it, since a single comb over thousands of cells is slow
+    placements = []
+    if mines_left is not None:
+        first = max(mines_left - unconstrained, 0)
+        placements = [0] * first
+        if first <= mines_left:
+            placements.append(comb(unconstrained, mines_left - first))
+        for k in range(first + 1, min(mines_left, frontier) + 1):
+            m = mines_left - k
+            placements.append(placements[-1] * (m + 1) // (unconstrained - m))
+
+    def weight(polynomial):
+        """Total of a polynomial in frontier mines, weighted by the ways to place the rest."""
+        if mines_left is None:
+            return sum(polynomial)
+        return sum(ways * placements[k] for k, ways in enumerate(polynomial[:len(placements)]))
+
+    # Products of every component's ways before and after each component
+    before = [[1]]
+    for _, ways, _, _ in groups:
+        before.append(multiply(before[-1], ways))
+    after = [[1]]
+    for _, ways, _, _ in reversed(groups):
+        after.append(multiply(after[-1], ways))
+    after.reverse()
+
+    result = {}
+    for g, (cells, ways, cell_ways, estimates) in enumerate(groups):
+        if estimates is not None:
+            result.update(zip(cells, estimates))
+            continue
+        others = [1] if mines_left is None else multiply(before[g], after[g + 1])
+        total = weight(multiply(ways, others))
+        for cell, mine_ways in zip(cells, cell_ways):
+            result[cell] = weight(multiply(mine_ways, others)) / total if total else 0.0
+
+    rest = None
+    if mines_left is not None and unconstrained > 0:
+        total = weight(before[-1])
+        expected = sum(ways * placements[k] * (mines_left - k)
+                       for k, ways in enumerate(before[-1][:len(placements)]))
+        rest = expected / total / unconstrained if total else 0.0
+    return result, rest
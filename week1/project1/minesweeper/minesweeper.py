@@ -6,6 +6,9 @@ https://cs50.harvard.edu/ai/2020/projects/1/minesweeper/
 """
 
 import random
+from collections import deque
+
+import frontier
 
 
 class Minesweeper():
@@ -104,6 +107,9 @@ class Sentence():
     def __eq__(self, other):
         return self.cells == other.cells and self.count == other.count
 
+    def __hash__(self):
+        return hash((frozenset(self.cells), self.count))
+
     def __str__(self):
         return f"{self.cells} = {self.count}"
 
@@ -150,13 +156,20 @@ class Sentence():
 class MinesweeperAI():
     """
     Minesweeper game player
+
+    Knowledge is a set of sentences, indexed by the cells they mention.
+    When a fact changes a sentence, or a new sentence is added, the sentence
+    goes on a worklist; inference only revisits worklist sentences, and only
+    compares them with the sentences that share a cell with them. Sentences
+    left with no cells are dropped, and duplicates are never stored.
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None):
 
-        # Set initial height and width
+        # Set initial height and width, and the number of mines if known
         self.height = height
         self.width = width
+        self.total_mines = mines
 
         # Keep track of which cells have been clicked on
         self.moves_made = set()
@@ -165,91 +178,121 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Safe cells not yet clicked on
+        self.safe_moves = set()
+
+        # Set of sentences about the game known to be true,
+        # and the sentences mentioning each cell
+        self.knowledge = set()
+        self.containing = {}
+
+        # Sentences added or changed since inference last ran
+        self.worklist = deque()
+
+        # Frontier components enumerated by the last guess
+        self.component_cache = {}
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
+        if cell in self.mines:
+            return
         self.mines.add(cell)
-        for sentence in self.knowledge:
+        for sentence in list(self.containing.get(cell, ())):
+            self.remove_sentence(sentence)
             sentence.mark_mine(cell)
+            self.add_sentence(sentence)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
+        if cell in self.safes:
+            return
         self.safes.add(cell)
-        for sentence in self.knowledge:
+        if cell not in self.moves_made:
+            self.safe_moves.add(cell)
+        for sentence in list(self.containing.get(cell, ())):
+            self.remove_sentence(sentence)
             sentence.mark_safe(cell)
+            self.add_sentence(sentence)
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge and the worklist,
+        unless it has no cells left or is already known.
+        """
+        if not sentence.cells or sentence in self.knowledge:
+            return
+        self.knowledge.add(sentence)
+        for cell in sentence.cells:
+            self.containing.setdefault(cell, set()).add(sentence)
+        self.worklist.append(sentence)
+
+    def remove_sentence(self, sentence):
+        """Removes a sentence from the knowledge, before it is changed or dropped."""
+        self.knowledge.discard(sentence)
+        for cell in sentence.cells:
+            cells = self.containing[cell]
+            cells.discard(sentence)
+            if not cells:
+                del self.containing[cell]
 
     def add_knowledge(self, cell, count):
         """
-        TODO
         Called when the Minesweeper board tells us, for a given
         safe cell, how many neighboring cells have mines in them.
 
-        This function should:
-            1) mark the cell as a move that has been made
-            2) mark the cell as safe
-            3) add a new sentence to the AI's knowledge base
-               based on the value of `cell` and `count`
-            4) mark any additional cells as safe or as mines
-               if it can be concluded based on the AI's knowledge base
-            5) add any new sentences to the AI's knowledge base
-               if they can be inferred from existing knowledge
-        """
-        # 1) mark the cell as a move that has been made
+        Marks the cell as a move made and as safe, adds a sentence
+        about its undetermined neighbours, then infers every safe cell,
+        mine and subset sentence that follows from the changes.
+        """
         self.moves_made.add(cell)
-
-        # 2) mark the cell as safe
+        self.safe_moves.discard(cell)
         self.mark_safe(cell)
 
-        # 3) add a new sentence to the AI's knowledge base based on the value of 'cell' and 'count'.
-        #    only include cells whose state are still undetermined
+        # Only include neighbours whose state is still undetermined
         nearby_cells = self.nearby_cells(cell)
-        nearby_undetermined_cells = nearby_cells - self.safes - self.mines
-        nearby_undetermined_count = count - (len(nearby_cells) - len(nearby_cells - self.mines))
-        new_sentence = Sentence(nearby_undetermined_cells,
-                                nearby_undetermined_count)  # todo: get set of cells surrounding cell
-        self.knowledge.append(new_sentence)
-
-        # 4) mark any additional cells as safe or as mines if it can be concluded based on the AI's knowledge base
-        # found_safes = self.safes
-        # found_mines = self.mines
-        for sentence in self.knowledge:
-            self.safes = self.safes | sentence.known_safes()
-            self.mines = self.mines | sentence.known_mines()
-
-        print(len(self.safes), "Safes found: ", self.safes)
-        print(len(self.mines), "Mines found: ", self.mines)
-        print("Knowledge size: ", len(self.knowledge))
-
-        for cell in self.safes:
-            self.mark_safe(cell)
-        for cell in self.mines:
-            self.mark_mine(cell)
-
-        # 5) add any new sentences to the AI's knowledge base if they can be inferred from existing knowledge
-        new_knowledges = []
-        for subset in self.knowledge:
-            for superset in self.knowledge:
-                if subset.cells < superset.cells:  # if 'subset' is a proper subset of 'superset'
-                    new_cells = superset.cells - subset.cells
-                    new_count = superset.count - subset.count
-                    new_sentence = Sentence(new_cells, new_count)
-                    new_knowledges.append(new_sentence)
-
-        for new_knowledge in new_knowledges:
-            if new_knowledge not in self.knowledge:  # <==
-                self.knowledge.append(new_knowledge)
+        self.add_sentence(Sentence(nearby_cells - self.safes - self.mines,
+                                   count - len(nearby_cells & self.mines)))
+        self.infer()
+
+    def infer(self):
+        """
+        Draws conclusions from each sentence on the worklist until it is empty:
+        its cells are all mines or all safe, or it is a subset or superset of
+        a sentence sharing a cell with it, giving a new sentence for the difference.
+        """
+        while self.worklist:
+            sentence = self.worklist.popleft()
+            if sentence not in self.knowledge:
+                continue
+
+            mines = sentence.known_mines()
+            safes = sentence.known_safes()
+            if mines or safes:
+                self.remove_sentence(sentence)
+                for cell in list(mines):
+                    self.mark_mine(cell)
+                for cell in list(safes):
+                    self.mark_safe(cell)
+                continue
+
+            overlapping = set()
+            for cell in sentence.cells:
+                overlapping |= self.containing[cell]
+            overlapping.discard(sentence)
+            for other in overlapping:
+                if sentence.cells < other.cells:
+                    self.add_sentence(Sentence(other.cells - sentence.cells, other.count - sentence.count))
+                elif other.cells < sentence.cells:
+                    self.add_sentence(Sentence(sentence.cells - other.cells, sentence.count - other.count))
 
     def make_safe_move(self):
         """
-        TODO
         Returns a safe cell to choose on the Minesweeper board.
         The move must be known to be safe, and not already a move
         that has been made.
@@ -257,15 +300,12 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        available_moves = self.safes - self.moves_made
-        if available_moves:
-            return random.sample(available_moves, 1)[0]
-        else:
-            return None
+        if self.safe_moves:
+            return next(iter(self.safe_moves))
+        return None
 
     def make_random_move(self):
         """
-        TODO
         Returns a move to make on the Minesweeper board.
         Should choose randomly among cells that:
             1) have not already been chosen, and
@@ -274,19 +314,44 @@ class MinesweeperAI():
         unavailable_moves = self.moves_made | self.mines
         available_moves = self.all_cells() - unavailable_moves
         if available_moves:
-            return random.sample(available_moves, 1)[0]
+            return random.choice(sorted(available_moves))
         else:
             return None
 
-        # raise NotImplementedError
+    def mine_probabilities(self):
+        """
+        Returns (cell -> probability it is a mine, for every undetermined
+        cell a sentence mentions; probability for each other undetermined
+        cell, or None if the number of mines on the board isn't known).
+        """
+        unknown = self.height * self.width - len(self.safes) - len(self.mines)
+        mines_left = None if self.total_mines is None else self.total_mines - len(self.mines)
+        sentences = [(sentence.cells, sentence.count) for sentence in self.knowledge]
+        return frontier.probabilities(sentences, unknown, mines_left, self.component_cache)
+
+    def make_guess_move(self):
+        """
+        Returns the undetermined cell least likely to be a mine, counting
+        every mine configuration consistent with the knowledge, or None
+        if there are no undetermined cells left.
+        """
+        probabilities, rest = self.mine_probabilities()
+        best = min(sorted(probabilities), key=probabilities.get, default=None)
+        if rest is not None and (best is None or rest < probabilities[best]):
+            unconstrained = self.all_cells() - self.safes - self.mines - probabilities.keys()
+            if unconstrained:
+                return random.choice(sorted(unconstrained))
+        if best is None:
+            return self.make_random_move()
+        return best
 
     def all_cells(self):
         """
         Returns a set of all the moves in the board
         """
         cells = set()
-        for i in range(self.height - 1):
-            for j in range(self.width - 1):
+        for i in range(self.height):
+            for j in range(self.width):
                 cells.add((i, j))
         return cells
 
@@ -0,0 +1,115 @@
+"""
+Headless Minesweeper simulator
+
+Plays many seeded games of MinesweeperAI without the pygame runner, and
+reports how often it wins and how long its moves take.
+
+    python simulate.py games height width mines
+        mines is a count, or a density such as 0.15 of the cells
+
+Game i is seeded with i, so a run is reproducible and two versions of the
+AI can be compared on the same boards. Games are spread over a process
+pool. Each move's latency is the time spent in add_knowledge (inference)
+plus choosing the next move; moves per second are per worker, summed over
+all games, so they don't depend on how many processes run.
+"""
+
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+PERCENTILES = [50, 90, 99]
+
+
+def main():
+    if len(sys.argv) != 5:
+        sys.exit("Usage: python simulate.py games height width mines")
+    games, height, width = (int(arg) for arg in sys.argv[1:4])
+    mines = float(sys.argv[4]) if "." in sys.argv[4] else int(sys.argv[4])
+    if isinstance(mines, float):
+        mines = round(mines * height * width)
+    if not 0 < mines < height * width:
+        sys.exit(f"mines must be between 1 and {height * width - 1}")
+
+    start = time.perf_counter()
+    results = simulate(games, height, width, mines)
+    elapsed = time.perf_counter() - start
+
+    report = summarize(results)
+    print(f"{games} games on {height}x{width} with {mines} mines in {elapsed:.2f}s")
+    print(f"Win rate: {report['wins'] / games:.1%} ({report['wins']} of {games})")
+    print(f"Moves: {report['moves']} at {report['moves_per_second']:.0f} per second")
+    latencies = ", ".join(f"p{p} {report['latency'][p] * 1000:.3f}ms" for p in PERCENTILES)
+    print(f"Move latency: {latencies}, max {report['latency'][100] * 1000:.3f}ms")
+
+
+def simulate(games, height, width, mines, guess=True, processes=None):
+    """
+    Plays seeded games 0 to games - 1, returning a list of
+    (won, list of move latencies in seconds) in seed order.
+    """
+    tasks = [(seed, height, width, mines, guess) for seed in range(games)]
+    if games <= 1 or processes == 1:
+        return list(map(play, tasks))
+    with Pool(processes) as pool:
+        return pool.map(play, tasks, chunksize=max(games // (4 * (processes or 8)), 1))
+
+
+def play(task):
+    """
+    Plays one game, returning (won, list of move latencies in seconds).
+    With `guess`, the AI guesses with make_guess_move, else at random.
+    """
+    seed, height, width, mines, guess = task
+    random.seed(seed)
+    game = Minesweeper(height, width, mines)
+    ai = MinesweeperAI(height, width, mines)
+
+    latencies = []
+    start = time.perf_counter()
+    move = ai.make_guess_move() if guess else ai.make_random_move()
+    latencies.append(time.perf_counter() - start)
+
+    while move is not None:
+        if game.is_mine(move):
+            return False, latencies
+        start = time.perf_counter()
+        ai.add_knowledge(move, game.nearby_mines(move))
+        if len(ai.moves_made) == height * width - mines:
+            latencies.append(time.perf_counter() - start)
+            return True, latencies
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_guess_move() if guess else ai.make_random_move()
+        latencies.append(time.perf_counter() - start)
+    return False, latencies
+
+
+def summarize(results):
+    """
+    Returns a dict of wins, moves, moves_per_second and latency, a dict
+    of percentile -> seconds for PERCENTILES and 100 (the slowest move).
+    """
+    latencies = sorted(latency for _, game in results for latency in game)
+    total = sum(latencies)
+    return {
+        "wins": sum(won for won, _ in results),
+        "moves": len(latencies),
+        "moves_per_second": len(latencies) / total if total else 0.0,
+        "latency": {p: percentile(latencies, p) for p in PERCENTILES + [100]}
+    }
+
+
+def percentile(values, p):
+    """Returns the p-th percentile of sorted values, by the nearest rank."""
+    if not values:
+        return 0.0
+    rank = max(-(-p * len(values) // 100), 1)
+    return values[rank - 1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import math
+import random
+
+import frontier
+
+from minesweeper import *
+
+
+def play(height, width, mines, seed):
+    """
+    Plays one game with the AI, checking its conclusions after every move.
+    Returns True if it won.
+    """
+    random.seed(seed)
+    game = Minesweeper(height, width, mines)
+    ai = MinesweeperAI(height, width)
+    while len(ai.moves_made) < height * width - mines:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+        if game.is_mine(move):
+            return False
+        ai.add_knowledge(move, game.nearby_mines(move))
+
+        assert ai.mines <= game.mines
+        assert not ai.safes & game.mines
+        assert all(sentence.cells for sentence in ai.knowledge)
+        for cell, sentences in ai.containing.items():
+            assert sentences and all(cell in sentence.cells and sentence in ai.knowledge
+                                     for sentence in sentences)
+    return True
+
+
+def test_inference_is_sound():
+    """
+    GIVEN   seeded games on small and larger boards
+    WHEN    the AI plays them out
+    THEN    every cell it concludes is a mine is one, no cell it concludes is safe is one,
+            and its knowledge holds no empty sentences or stale index entries
+    """
+    wins = sum(play(8, 8, 8, seed) for seed in range(100))
+    assert wins > 50
+    play(30, 30, 120, seed=0)
+
+
+def test_subset_inference():
+    """
+    GIVEN   a 2x3 board with a 1 revealed in each cell of the top row
+    WHEN    the knowledge is added
+    THEN    the AI infers from overlapping sentences that the middle
+            bottom cell is the mine and the others are safe
+    """
+    ai = MinesweeperAI(height=2, width=3)
+    ai.add_knowledge((0, 0), 1)
+    ai.add_knowledge((0, 1), 1)
+    ai.add_knowledge((0, 2), 1)
+    assert ai.mines == {(1, 1)}
+    assert {(1, 0), (1, 2)} <= ai.safes
+    assert ai.make_safe_move() in {(1, 0), (1, 2)}
+    assert not ai.knowledge
+
+
+def test_all_cells():
+    ai = MinesweeperAI(height=3, width=4)
+    assert ai.all_cells() == {(i, j) for i in range(3) for j in range(4)}
+
+
+def test_mine_probabilities():
+    """
+    GIVEN   random sentences about a row of cells, some cells no sentence mentions,
+            and a number of mines left
+    WHEN    mine probabilities are computed by component enumeration
+    THEN    they match brute-force enumeration weighted by the ways to place the other mines
+    """
+    rng = random.Random(0)
+    for _ in range(200):
+        cells = [(0, j) for j in range(rng.randint(1, 7))]
+        mines = {cell for cell in cells if rng.random() < 0.3}
+        sentences = []
+        for _ in range(rng.randint(1, 4)):
+            subset = set(rng.sample(cells, rng.randint(1, len(cells))))
+            sentences.append((subset, len(subset & mines)))
+        constrained = sorted(set().union(*[subset for subset, _ in sentences]))
+        unconstrained = rng.randint(0, 3)
+        mines_left = len(mines & set(constrained)) + rng.randint(0, unconstrained)
+
+        total = 0
+        mine_weights = {cell: 0 for cell in constrained}
+        for m in range(1 << len(constrained)):
+            placed = {cell for i, cell in enumerate(constrained) if m >> i & 1}
+            rest = mines_left - len(placed)
+            if all(len(subset & placed) == count for subset, count in sentences) and 0 <= rest <= unconstrained:
+                weight = math.comb(unconstrained, rest)
+                total += weight
+                for cell in placed:
+                    mine_weights[cell] += weight
+
+        result, _ = frontier.probabilities(sentences, len(constrained) + unconstrained, mines_left)
+        for cell in constrained:
+            assert abs(result[cell] - mine_weights[cell] / total) < 1e-9
+
+
+def test_guess_move():
+    """
+    GIVEN   boards with one mine and a 1 revealed in the corner
+    WHEN    the AI has to guess
+    THEN    it picks a cell away from the 1, where there can be no mine
+    """
+    ai = MinesweeperAI(height=1, width=4, mines=1)
+    ai.add_knowledge((0, 0), 1)
+    assert ai.mines == {(0, 1)}
+    assert ai.make_guess_move() in {(0, 2), (0, 3)}
+
+    ai = MinesweeperAI(height=2, width=4, mines=1)
+    ai.add_knowledge((0, 0), 1)
+    probabilities, rest = ai.mine_probabilities()
+    assert probabilities == {(0, 1): 1 / 3, (1, 0): 1 / 3, (1, 1): 1 / 3}
+    assert rest == 0
+    assert ai.make_guess_move() in {(0, 2), (0, 3), (1, 2), (1, 3)}
+
+
+def test_simulate():
+    """
+    GIVEN   seeded games played headlessly, in one process and across a pool
+    WHEN    they are simulated and summarized
+    THEN    the results are the same, and the summary counts every move
+    """
+    import simulate
+    serial = simulate.simulate(40, 8, 8, 10, processes=1)
+    pooled = simulate.simulate(40, 8, 8, 10, processes=2)
+    assert [won for won, _ in serial] == [won for won, _ in pooled]
+    assert [len(game) for _, game in serial] == [len(game) for _, game in pooled]
+
+    report = simulate.summarize(serial)
+    assert report["moves"] == sum(len(game) for _, game in serial)
+    assert report["latency"][50] <= report["latency"][99] <= report["latency"][100]
+    assert simulate.percentile([1, 2, 3, 4], 50) == 2
+
+
+def test_dense_latency():
+    """
+    GIVEN   seeded games on a dense 100x100 board, with 2000 mines
+    WHEN    they are simulated
+    THEN    no move, guesses included, takes as long as a second
+    """
+    import simulate
+    results = simulate.simulate(6, 100, 100, 2000, processes=1)
+    assert simulate.summarize(results)["latency"][100] < 1.0
+
+
+def test_estimated_component(monkeypatch):
+    """
+    GIVEN   a component with more enumeration states than MAX_STATES allows
+    WHEN    mine probabilities are computed, twice with the same cache
+    THEN    its cells get each sentence's ratio, and the second call reuses it
+    """
+    monkeypatch.setattr(frontier, "MAX_STATES", 1)
+    sentences = [({(0, 0), (0, 1)}, 1), ({(0, 1), (0, 2), (0, 3)}, 1)]
+    cache = {}
+    probabilities, rest = frontier.probabilities(sentences, 10, 3, cache)
+    assert probabilities[(0, 0)] == 0.5
+    assert math.isclose(probabilities[(0, 1)], (1 / 2 + 1 / 3) / 2)
+    assert math.isclose(probabilities[(0, 3)], 1 / 3)
+    assert 0 <= rest <= 1
+
+    cached = dict(cache)
+    assert frontier.probabilities(sentences, 10, 3, cache) == (probabilities, rest)
+    assert all(cache[key] is group for key, group in cached.items())